@@ -1,49 +1,154 @@
+import codecs
+import io
 import os
+import queue
+import selectors
 import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QFileDialog, QListWidget, QListWidgetItem, QMessageBox, QLineEdit,
-    QTextEdit
+    QTextEdit, QSpinBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+
+READ_BUFFER_SIZE = 1 << 16
+PIPE_SIZE = 1 << 20
+FLUSH_INTERVAL = 0.05
+LOG_FLUSH_MS = 100
+
+
+def _enlarge_pipe(stream):
+    """Fallback para Python < 3.10: amplía el pipe en Linux vía fcntl."""
+    try:
+        import fcntl
+        # F_SETPIPE_SZ solo aparece en el módulo fcntl a partir de 3.10
+        fcntl.fcntl(stream.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031), PIPE_SIZE)
+    except (ImportError, OSError):
+        pass
+
+
+def _read_chunks(stream):
+    """Devuelve bloques de bytes del pipe a medida que llegan, hasta EOF."""
+    if os.name == "nt":
+        # En Windows select() solo admite sockets, no pipes: lectura bloqueante
+        # (este generador ya corre en un hilo del pool, no en el de Qt).
+        while True:
+            chunk = stream.read1(READ_BUFFER_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    fd = stream.fileno()
+    os.set_blocking(fd, False)
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while True:
+            selector.select()
+            try:
+                chunk = os.read(fd, READ_BUFFER_SIZE)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                return
+            yield chunk
+
+
+def _iter_line_batches(stream):
+    """Lee la salida en bloques y devuelve listas de líneas completas."""
+    # Traduce \r\n y \r a \n como hacía text=True (el progreso usa \r solo); un \r al
+    # final de un bloque se retiene hasta ver si el siguiente empieza por \n
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+    )
+    partial = ""
+    for chunk in _read_chunks(stream):
+        lines = (partial + decoder.decode(chunk)).split("\n")
+        partial = lines.pop()
+        if lines:
+            yield lines
+    partial += decoder.decode(b"", final=True)
+    if partial.endswith("\n"):  # \r retenido al final de la salida
+        partial = partial[:-1]
+    if partial:
+        yield [partial]
+
+
+def _run_one(exe_path, iso, messages):
+    """Convierte un ISO con xdvdfs; los lotes de líneas van a `messages`."""
+    name = os.path.basename(iso)
+    messages.put([f"Convirtiendo: {iso}"])
+
+    base = os.path.splitext(iso)[0]
+    output_iso = f"{base}.xiso.iso"
+
+    cmd = [exe_path, "pack", iso, output_iso]
+
+    try:
+        # Buffer de lectura grande: xdvdfs escribe una línea por sector.
+        popen_kwargs = {"bufsize": READ_BUFFER_SIZE}
+        if sys.version_info >= (3, 10):
+            popen_kwargs["pipesize"] = PIPE_SIZE
+
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **popen_kwargs
+        )
+        if sys.version_info < (3, 10) and sys.platform.startswith("linux"):
+            _enlarge_pipe(process.stdout)
+
+        for lines in _iter_line_batches(process.stdout):
+            messages.put([f"[{name}] {line.strip()}" for line in lines])
+
+        process.wait()
+        if process.returncode == 0:
+            return f"✔ Finalizado: {output_iso}"
+        return f"✖ Error al convertir: {iso}"
+
+    except Exception as e:
+        return f"✖ Error ejecutando xdvdfs: {str(e)}"
 
 
 class ConverterThread(QThread):
     progress = pyqtSignal(str)
 
-    def __init__(self, exe_path, iso_paths):
+    def __init__(self, exe_path, iso_paths, max_workers=None):
         super().__init__()
         self.exe_path = exe_path
         self.iso_paths = iso_paths
+        self.max_workers = max_workers or os.cpu_count() or 1
 
     def run(self):
-        for iso in self.iso_paths:
-            self.progress.emit(f"Convirtiendo: {iso}")
-
-            base = os.path.splitext(iso)[0]
-            output_iso = f"{base}.xiso.iso"
-
-            cmd = [self.exe_path, "pack", iso, output_iso]
+        if not self.iso_paths:
+            return
 
+        # Cada xdvdfs es un proceso independiente: los hilos solo esperan a Popen.
+        workers = max(1, min(self.max_workers, len(self.iso_paths)))
+        messages = queue.Queue()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(_run_one, self.exe_path, iso, messages)
+                for iso in self.iso_paths
+            }
+            while pending:
+                done, pending = wait(pending, timeout=FLUSH_INTERVAL, return_when=FIRST_COMPLETED)
+                batch = self._drain(messages)
+                batch.extend(future.result() for future in done)
+                if batch:
+                    self.progress.emit("\n".join(batch))
+
+    def _drain(self, messages):
+        batch = []
+        while True:
             try:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True
-                )
-
-                for line in process.stdout:
-                    self.progress.emit(line.strip())
-
-                process.wait()
-                if process.returncode == 0:
-                    self.progress.emit(f"✔ Finalizado: {output_iso}")
-                else:
-                    self.progress.emit(f"✖ Error al convertir: {iso}")
-
-            except Exception as e:
-                self.progress.emit(f"✖ Error ejecutando xdvdfs: {str(e)}")
+                batch.extend(messages.get_nowait())
+            except queue.Empty:
+                return batch
 
 
 class XisoConverterApp(QWidget):
@@ -77,6 +182,7 @@ class XisoConverterApp(QWidget):
 
         # ---- ISO LIST ----
         self.iso_list = QListWidget()
+        self.iso_list.setUniformItemSizes(True)
         layout.addWidget(self.iso_list)
 
         # ---- BUTTONS ----
@@ -87,6 +193,12 @@ class XisoConverterApp(QWidget):
         btn_selected.clicked.connect(self.convert_selected)
         btn_all.clicked.connect(self.convert_all)
 
+        btn_row.addWidget(QLabel("Conversiones simultáneas:"))
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_input.setValue(self.workers_input.maximum())
+        btn_row.addWidget(self.workers_input)
+
         btn_row.addWidget(btn_selected)
         btn_row.addWidget(btn_all)
         layout.addLayout(btn_row)
@@ -95,12 +207,25 @@ class XisoConverterApp(QWidget):
         layout.addWidget(QLabel("Log:"))
         self.log_box = QTextEdit()
         self.log_box.setReadOnly(True)
+        # Los mensajes se acumulan y se vuelcan juntos cada LOG_FLUSH_MS
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self._flush_log)
         layout.addWidget(self.log_box)
 
         self.setLayout(layout)
 
     def log(self, text):
-        self.log_box.append(text)
+        self._log_buf.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if self._log_buf:
+            self.log_box.append("\n".join(self._log_buf))
+            self._log_buf.clear()
 
     def select_exe(self):
         file, _ = QFileDialog.getOpenFileName(self, "Seleccionar xdvdfs.exe", "", "Executable (*.exe)")
@@ -120,26 +245,40 @@ class XisoConverterApp(QWidget):
         if not os.path.isdir(folder):
             return
 
-        for file in os.listdir(folder):
-            if file.lower().endswith(".iso") and not file.lower().endswith(".xiso.iso"):
-                item = QListWidgetItem(file)
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item.setCheckState(Qt.CheckState.Unchecked)
-                self.iso_list.addItem(item)
+        # Sin repintados ni señales mientras se rellena la lista
+        self.iso_list.setUpdatesEnabled(False)
+        self.iso_list.blockSignals(True)
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    lname = name.lower()
+                    # Comparación de sufijos por slicing: sin llamadas a método
+                    if lname[-4:] != ".iso" or lname[-9:] == ".xiso.iso":
+                        continue
+                    item = QListWidgetItem(name)
+                    item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                    item.setCheckState(Qt.CheckState.Unchecked)
+                    self.iso_list.addItem(item)
+        finally:
+            self.iso_list.blockSignals(False)
+            self.iso_list.setUpdatesEnabled(True)
 
         if self.iso_list.count() == 0:
             QMessageBox.information(self, "Info", "No se encontraron archivos .iso")
 
     def get_selected_isos(self):
         folder = self.folder_input.text()
-        paths = []
-
-        for i in range(self.iso_list.count()):
-            item = self.iso_list.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                paths.append(os.path.join(folder, item.text()))
+        # Métodos y constantes en locales: la lista puede tener miles de ISOs
+        item_at = self.iso_list.item
+        join = os.path.join
+        checked = Qt.CheckState.Checked
 
-        return paths
+        return [
+            join(folder, item.text())
+            for item in map(item_at, range(self.iso_list.count()))
+            if item.checkState() == checked
+        ]
 
     def convert_selected(self):
         iso_paths = self.get_selected_isos()
@@ -150,11 +289,10 @@ class XisoConverterApp(QWidget):
 
     def convert_all(self):
         folder = self.folder_input.text()
-        iso_paths = []
+        item_at = self.iso_list.item
+        join = os.path.join
 
-        for i in range(self.iso_list.count()):
-            file = self.iso_list.item(i).text()
-            iso_paths.append(os.path.join(folder, file))
+        iso_paths = [join(folder, item_at(i).text()) for i in range(self.iso_list.count())]
 
         if not iso_paths:
             QMessageBox.warning(self, "Aviso", "No hay archivos para convertir.")
@@ -170,7 +308,7 @@ class XisoConverterApp(QWidget):
 
         self.log("---- Iniciando conversión ----")
 
-        self.thread = ConverterThread(exe_path, iso_paths)
+        self.thread = ConverterThread(exe_path, iso_paths, self.workers_input.value())
         self.thread.progress.connect(self.log)
         self.thread.start()
 
@@ -1,7 +1,8 @@
 import os
+import ctypes
 import json
-import xml.etree.ElementTree as ET
-import psutil
+import re
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -14,7 +15,7 @@ from PyQt6.QtWidgets import (
     QTextEdit,
     QProgressDialog,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 
 """
 This module provides a small utility for maintaining configuration files used
@@ -39,6 +40,159 @@ to the same directories on subsequent runs.
 
 CONFIG_FILE = "config.json"
 
+# Coalesce log messages and append them to the log box at most this often
+LOG_FLUSH_MS = 100
+
+# Report progress to the GUI only once every this many items
+UI_REFRESH_INTERVAL = 128
+
+# Smaller jobs finish before a progress dialog could even be painted
+PROGRESS_MIN_PROFILES = 50
+PROGRESS_MIN_INI_BYTES = 64 * 1024
+
+
+# Drive letter of the first <GamePath> element, e.g. <GamePath>C:\Games\...
+_GAMEPATH_RE = re.compile(rb"<GamePath>([^<])(:[^<]+)")
+
+# "Application=<path>" lines of a PCLauncher INI; group 1 keeps the key as written
+_APPLICATION_RE = re.compile(rb"^([ \t]*application)=([^\r\n]*)", re.IGNORECASE | re.MULTILINE)
+
+
+def _rewrite_game_path(file, xml_path, new_letter):
+    """Change the drive letter of <GamePath> in one profile.
+
+    The file is patched as bytes instead of being parsed and re-serialised,
+    so everything except the drive letter (declaration, encoding, namespaces,
+    whitespace) is kept as is.  Returns a ``(modified, message)`` tuple;
+    ``message`` is empty when the profile has no absolute GamePath.  Runs on
+    worker threads, so it must not touch any widget.
+    """
+    try:
+        with open(xml_path, "rb") as f:
+            data = f.read()
+        m = _GAMEPATH_RE.search(data)
+        if m is None:
+            return False, ""
+        letter = new_letter.encode("ascii")
+        # Already on the target drive (drive letters are case-insensitive):
+        # skip the write so re-runs leave files and their mtime untouched
+        if m.group(1).upper() == letter.upper():
+            return False, ""
+        new_data = data[:m.start(1)] + letter + data[m.end(1):]
+        with open(xml_path, "wb") as f:
+            f.write(new_data)
+        new_path = (letter + m.group(2)).decode("utf-8", errors="replace")
+        return True, f"[OK] {file} → {new_path}"
+    except Exception as e:
+        return False, f"[ERROR] {file}: {e}"
+
+
+class TeknoWorker(QThread):
+    """Rewrite the GamePath drive letter of TeknoParrot profiles off the GUI thread."""
+
+    progress = pyqtSignal(str)
+    advanced = pyqtSignal(int)
+    completed = pyqtSignal(int)
+
+    def __init__(self, xml_files, new_letter):
+        super().__init__()
+        self.xml_files = xml_files  # list of (file name, full path)
+        self.new_letter = new_letter
+
+    def run(self):
+        modified_count = 0
+        # Profiles are independent files: patch them on a thread pool and
+        # report the results in submission order.
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda item: _rewrite_game_path(item[0], item[1], self.new_letter), self.xml_files
+            )
+            for done, (modified, message) in enumerate(results, 1):
+                if message:
+                    self.progress.emit(message)
+                modified_count += modified
+                if done % UI_REFRESH_INTERVAL == 0:
+                    self.advanced.emit(done)
+        self.completed.emit(modified_count)
+
+
+class PcIniWorker(QThread):
+    """Rewrite the Application= entries of a PC Games INI off the GUI thread."""
+
+    progress = pyqtSignal(str)
+    completed = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, ini_file, pc_games_dir):
+        super().__init__()
+        self.ini_file = ini_file
+        self.pc_games_dir = pc_games_dir
+
+    def run(self):
+        # Normalise path once: backslashes only and no trailing separator
+        pc_root = self.pc_games_dir.rstrip("\\/").replace("/", "\\").encode("utf-8")
+        # Work on the raw bytes so that comments, formatting and line endings are preserved
+        try:
+            with open(self.ini_file, "rb") as f:
+                data = f.read()
+        except Exception as e:
+            self.failed.emit(f"No se pudo leer el archivo INI: {e}")
+            return
+        modified_count = 0
+
+        def rewrite(match):
+            nonlocal modified_count
+            key = match.group(1)
+            original_path = match.group(2).strip()
+            # Preserve surrounding quotes if present
+            quote_char = b""
+            if len(original_path) > 1 and original_path[:1] == original_path[-1:] and original_path[:1] in (b'"', b"'"):
+                quote_char = original_path[:1]
+                path_content = original_path[1:-1]
+            else:
+                path_content = original_path
+            # Relative paths are left unchanged
+            if len(path_content) < 2 or path_content[1:2] != b":":
+                return match.group(0)
+            # Common case 'G:\\PC\\Brawlout\\Brawlout.exe': drop the drive and the
+            # first folder by slicing at the second separator → '\\Brawlout\\Brawlout.exe'
+            first_sep = path_content.find(b"\\")
+            second_sep = path_content.find(b"\\", first_sep + 1) if first_sep != -1 else -1
+            if second_sep != -1:
+                new_path_content = pc_root + path_content[second_sep:]
+            else:
+                # No subdirectory: 'G:\\Game.exe' → ['G:', 'Game.exe'], 'G:' → ['G:']
+                parts = path_content.split(b"\\")
+                relative_parts = parts[1:]
+                if relative_parts:
+                    new_path_content = pc_root + b"\\" + b"\\".join(relative_parts)
+                else:
+                    new_path_content = pc_root
+            modified_count += 1
+            self.progress.emit(
+                f"[OK] {key.strip().decode('utf-8', 'replace')} → "
+                f"{new_path_content.decode('utf-8', 'replace')}"
+            )
+            return key + b"=" + quote_char + new_path_content + quote_char
+
+        new_data = _APPLICATION_RE.sub(rewrite, data)
+        # Write modifications to a sibling file and swap it in, so a crash
+        # halfway through never leaves a truncated INI behind
+        tmp_file = self.ini_file + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(new_data)
+            os.replace(tmp_file, self.ini_file)
+        except Exception as e:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            self.failed.emit(f"No se pudo escribir el archivo INI: {e}")
+            return
+        self.completed.emit(modified_count)
+
 
 class TeknoParrotTool(QWidget):
     def __init__(self):
@@ -51,6 +205,9 @@ class TeknoParrotTool(QWidget):
         self.folder = ""  # UserProfiles folder for TeknoParrot
         self.pc_ini_file = ""  # PC Games INI file path
         self.pc_games_dir = ""  # Target root directory for PC Games
+        self._worker = None  # Running TeknoWorker / PcIniWorker, if any
+        self._progress = None  # Progress dialog shown while the worker runs
+        self._last_saved_config = None  # What config.json holds, to skip no-op saves
 
         layout = QVBoxLayout()
 
@@ -114,6 +271,12 @@ class TeknoParrotTool(QWidget):
         layout.addWidget(QLabel("Log de actividad:"))
         self.logBox = QTextEdit()
         self.logBox.setReadOnly(True)
+        # Messages are buffered and appended together every LOG_FLUSH_MS
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self._flush_log)
         self.logBox.setFixedHeight(200)
         layout.addWidget(self.logBox)
 
@@ -145,9 +308,15 @@ class TeknoParrotTool(QWidget):
             "last_drive": self.comboDrive.currentText() if self.comboDrive.count() > 0 else "",
             "last_system": self.comboSystem.currentText(),
         }
+        if data == self._last_saved_config:
+            return
+        # Write a sibling file and swap it in so config.json is never left half-written
+        tmp_file = CONFIG_FILE + ".tmp"
         try:
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+            with open(tmp_file, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4)
+            os.replace(tmp_file, CONFIG_FILE)
+            self._last_saved_config = data
         except Exception as e:
             # Silent failure; do not interrupt user
             print(f"Warning: could not save configuration: {e}")
@@ -160,6 +329,7 @@ class TeknoParrotTool(QWidget):
             try:
                 with open(CONFIG_FILE, "r", encoding="utf-8") as f:
                     data = json.load(f)
+                    self._last_saved_config = data
                     self.folder = data.get("last_folder", "")
                     self.pc_ini_file = data.get("pc_ini_file", "")
                     self.pc_games_dir = data.get("pc_games_dir", "")
@@ -200,22 +370,14 @@ class TeknoParrotTool(QWidget):
     def load_available_drives(self):
         drives = []
         try:
-            # Use psutil to list mounted partitions; fallback to scanning letters.
-            partitions = psutil.disk_partitions(all=False)
-            for p in partitions:
-                if os.path.exists(p.device):
-                    # p.device may be like 'C:\\' or '/dev/sda1'; we only care for
-                    # Windows style mount points.  Compose the root path.
-                    if ":" in p.device:
-                        root = p.device.split(":")[0] + ":\\"
-                        drives.append(root)
+            # One WinAPI call returns a bitmask of drive letters (bit 0 = A:).
+            # Unlike probing each root, it never touches disconnected network
+            # drives or empty optical units.
+            mask = ctypes.windll.kernel32.GetLogicalDrives()
+            drives = [f"{chr(ord('A') + i)}:\\" for i in range(26) if mask & (1 << i)]
         except Exception:
+            # Not on Windows: there are no drive letters to offer
             pass
-        if not drives:
-            # Fallback: brute force A: through Z:
-            for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-                if os.path.exists(f"{c}:\\"):
-                    drives.append(f"{c}:\\")
         # Clear and populate the combo box
         self.comboDrive.clear()
         self.comboDrive.addItems(drives)
@@ -263,7 +425,14 @@ class TeknoParrotTool(QWidget):
     # Append text to the log box
     # --------------------------------------------------
     def log(self, message):
-        self.logBox.append(message)
+        self._log_buf.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if self._log_buf:
+            self.logBox.append("\n".join(self._log_buf))
+            self._log_buf.clear()
 
     # --------------------------------------------------
     # Update UI controls based on selected system
@@ -325,7 +494,8 @@ class TeknoParrotTool(QWidget):
         new_letter = new_drive_full[0]  # e.g. 'E'
         # Gather XML files from the selected folder
         try:
-            xml_files = [f for f in os.listdir(self.folder) if f.lower().endswith(".xml")]
+            with os.scandir(self.folder) as entries:
+                xml_files = [(e.name, e.path) for e in entries if e.name.lower().endswith(".xml")]
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error al listar archivos: {e}")
             return
@@ -333,34 +503,18 @@ class TeknoParrotTool(QWidget):
         if num_files == 0:
             QMessageBox.information(self, "Sin archivos", "No se encontraron XML en la carpeta seleccionada.")
             return
-        # Show an indeterminate progress dialog
-        progress = QProgressDialog("Modificando archivos XML...", None, 0, 0, self)
-        progress.setWindowTitle("Trabajando...")
-        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
-        progress.show()
+        if num_files >= PROGRESS_MIN_PROFILES:
+            self._show_progress("Modificando archivos XML...", num_files)
         self.log("------ INICIO DEL PROCESO ------")
         self.log(f"Total de perfiles: {num_files}")
         self.log(f"Nueva letra: {new_letter}")
-        modified_count = 0
-        for file in xml_files:
-            xml_path = os.path.join(self.folder, file)
-            try:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                gamePath_node = root.find("GamePath")
-                if gamePath_node is not None:
-                    old_path = gamePath_node.text
-                    if old_path and len(old_path) > 2 and old_path[1] == ":":
-                        # Replace drive letter only
-                        new_path = new_letter + old_path[1:]
-                        gamePath_node.text = new_path
-                        tree.write(xml_path, encoding="utf-8", xml_declaration=True)
-                        modified_count += 1
-                        self.log(f"[OK] {file} → {new_path}")
-            except Exception as e:
-                self.log(f"[ERROR] {file}: {e}")
-            QApplication.processEvents()
-        progress.close()
+        worker = TeknoWorker(xml_files, new_letter)
+        worker.advanced.connect(self._on_worker_advanced)
+        worker.completed.connect(self._on_tekno_completed)
+        self._start_worker(worker)
+
+    def _on_tekno_completed(self, modified_count):
+        self._finish_worker()
         self.log("------ PROCESO COMPLETADO ------")
         QMessageBox.information(self, "Completado", f"Perfiles modificados: {modified_count}")
         # Save the drive letter for next session
@@ -377,75 +531,17 @@ class TeknoParrotTool(QWidget):
         if not self.pc_games_dir or not os.path.isdir(self.pc_games_dir):
             QMessageBox.warning(self, "Error", "Debes seleccionar la carpeta donde están los juegos de PC.")
             return
-        # Normalise path (ensure no trailing backslash); avoid trailing path separators for join
-        pc_root = self.pc_games_dir.rstrip("\\/")
-        # Read the INI file line by line so that comments and formatting are preserved
-        try:
-            with open(self.pc_ini_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"No se pudo leer el archivo INI: {e}")
-            return
-        # Set up progress dialog; use an approximate count of entries to update
-        total_app_lines = sum(1 for line in lines if line.strip().lower().startswith("application="))
-        progress = QProgressDialog("Modificando archivo INI...", None, 0, total_app_lines, self)
-        progress.setWindowTitle("Trabajando...")
-        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
-        progress.show()
-        modified_count = 0
-        new_lines = []
-        step = 0
-        for line in lines:
-            stripped = line.strip()
-            lower = stripped.lower()
-            if lower.startswith("application="):
-                key, value = line.split("=", 1)
-                original_path = value.strip()
-                # Preserve surrounding quotes if present
-                quote_char = ''
-                if original_path and (original_path[0] == original_path[-1]) and original_path[0] in ('\'"', "\'"):
-                    quote_char = original_path[0]
-                    path_content = original_path[1:-1]
-                else:
-                    path_content = original_path
-                # Determine if this is an absolute path with a drive letter
-                if len(path_content) > 1 and path_content[1] == ":":
-                    # Split on backslash; handle missing directories gracefully
-                    parts = path_content.split("\\")
-                    # Remove the drive letter part (e.g. 'G:'), remove the first folder
-                    # Example: 'G:\\PC\\Brawlout\\Brawlout.exe' → ['G:', 'PC', 'Brawlout', 'Brawlout.exe']
-                    # relative_parts = ['Brawlout', 'Brawlout.exe']
-                    if len(parts) >= 3:
-                        relative_parts = parts[2:]
-                    elif len(parts) == 2:
-                        relative_parts = parts[1:]
-                    else:
-                        relative_parts = []
-                    # Build the new path
-                    new_path_content = os.path.join(pc_root, *relative_parts)
-                    # Normalise slashes to backslashes for consistency
-                    new_path_content = new_path_content.replace("/", "\\")
-                    new_val = f"{quote_char}{new_path_content}{quote_char}" if quote_char else new_path_content
-                    new_line = f"{key}={new_val}\n"
-                    new_lines.append(new_line)
-                    modified_count += 1
-                    self.log(f"[OK] {key.strip()} → {new_path_content}")
-                else:
-                    # Relative path; leave unchanged
-                    new_lines.append(line)
-                step += 1
-                progress.setValue(step)
-                QApplication.processEvents()
-            else:
-                new_lines.append(line)
-        progress.close()
-        # Write modifications back to file
-        try:
-            with open(self.pc_ini_file, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"No se pudo escribir el archivo INI: {e}")
-            return
+        # The number of entries is not known in advance; use the file size to
+        # decide whether an (indeterminate) dialog is worth showing
+        if os.path.getsize(self.pc_ini_file) >= PROGRESS_MIN_INI_BYTES:
+            self._show_progress("Modificando archivo INI...", 0)
+        worker = PcIniWorker(self.pc_ini_file, self.pc_games_dir)
+        worker.completed.connect(self._on_pc_games_completed)
+        worker.failed.connect(self._on_worker_failed)
+        self._start_worker(worker)
+
+    def _on_pc_games_completed(self, modified_count):
+        self._finish_worker()
         # Inform the user of completion
         QMessageBox.information(
             self,
@@ -455,6 +551,42 @@ class TeknoParrotTool(QWidget):
         # Save current configuration
         self.save_config()
 
+    # --------------------------------------------------
+    # Worker helpers shared by both systems
+    # --------------------------------------------------
+    def _show_progress(self, text, maximum):
+        self._progress = QProgressDialog(text, None, 0, maximum, self)
+        self._progress.setWindowTitle("Trabajando...")
+        self._progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        self._progress.show()
+
+    def _start_worker(self, worker):
+        self._worker = worker
+        worker.progress.connect(self.log)
+        self.btnApply.setEnabled(False)
+        worker.start()
+
+    def _on_worker_advanced(self, value):
+        if self._progress is not None:
+            self._progress.setValue(value)
+
+    def _finish_worker(self):
+        if self._progress is not None:
+            self._progress.close()
+            self._progress = None
+        self.btnApply.setEnabled(True)
+
+    def _on_worker_failed(self, message):
+        self._finish_worker()
+        QMessageBox.warning(self, "Error", message)
+
+    def closeEvent(self, event):
+        # Let a running rewrite finish: destroying the QThread mid-run would
+        # abort the process and could leave a profile half written
+        if self._worker is not None and self._worker.isRunning():
+            self._worker.wait()
+        super().closeEvent(event)
+
 
 # ------------------------------------------------------
 # Application entry point
@@ -26,11 +26,14 @@ Run:
 
 from __future__ import annotations
 
+import mmap
+from bisect import bisect_right
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
@@ -59,8 +62,18 @@ from PyQt6.QtWidgets import (
 )
 
 
-_SECTION_RE = re.compile(r"^\s*\[(?P<section>[^\]]+)\]\s*$")
-_KEYVAL_RE = re.compile(r"^(?P<prefix>\s*)(?P<key>[^=;\r\n]+?)\s*=\s*(?P<val>.*?)(?P<suffix>\s*)$")
+def _decode(b: bytes) -> str:
+    return b.decode("utf-8", errors="replace")
+
+
+def _split_lines(text: str) -> List[str]:
+    """Split on "\n" only (keeping line endings), matching the byte scan in IniDocument.load."""
+    lines = text.split("\n")
+    last = lines.pop()
+    out = [line + "\n" for line in lines]
+    if last:
+        out.append(last)
+    return out
 
 
 def _norm_section(s: str) -> str:
@@ -71,58 +84,85 @@ def _norm_key(k: str) -> str:
     return k.strip()
 
 
+_BOOL_TEXT = {
+    "true": True, "1": True, "yes": True, "on": True,
+    "false": False, "0": False, "no": False, "off": False,
+}
+
+
 def _is_bool_text(v: str) -> Optional[bool]:
-    t = v.strip().lower()
-    if t in {"true", "1", "yes", "on"}:
-        return True
-    if t in {"false", "0", "no", "off"}:
-        return False
-    return None
+    t = v.strip()
+    # Every bool token is at most 5 chars and starts with one of these: skip lower()
+    # for everything else
+    if not t or len(t) > 5 or t[0] not in "tTfF1yYnNoO0":
+        return None
+    return _BOOL_TEXT.get(t.lower())
 
 
 def _parse_int(v: str) -> Optional[int]:
+    s = v.strip()
     try:
-        s = v.strip()
-        if s.lower().startswith("0x"):
+        if s[:2] in ("0x", "0X"):
             return int(s, 16)
         return int(s, 10)
-    except Exception:
+    except ValueError:
         return None
 
 
-def _parse_float(v: str) -> Optional[float]:
-    try:
-        return float(v.strip())
-    except Exception:
-        return None
-
-
-_HEX_COLOR_RE = re.compile(r"^\s*0x(?P<hex>[0-9a-fA-F]{6}|[0-9a-fA-F]{8})\s*$")
+_HEX_DIGITS = "0123456789abcdefABCDEF"
 
 
 def _parse_hex_color(v: str) -> Optional[QColor]:
-    m = _HEX_COLOR_RE.match(v)
-    if not m:
+    # 0xRRGGBB / 0xAARRGGBB: one int(_, 16) and shifts instead of a regex plus one int() per channel
+    t = v.strip()
+    hx = t[2:]
+    if t[:2] != "0x" or len(hx) not in (6, 8) or hx.strip(_HEX_DIGITS):
         return None
-    hx = m.group("hex")
-    if len(hx) == 6:
-        r = int(hx[0:2], 16)
-        g = int(hx[2:4], 16)
-        b = int(hx[4:6], 16)
-        return QColor(r, g, b)
-    a = int(hx[0:2], 16)
-    r = int(hx[2:4], 16)
-    g = int(hx[4:6], 16)
-    b = int(hx[6:8], 16)
-    c = QColor(r, g, b)
-    c.setAlpha(a)
+    n = int(hx, 16)
+    c = QColor((n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF)
+    if len(hx) == 8:
+        c.setAlpha(n >> 24)
     return c
 
 
+_INT_RE = re.compile(r"\s*-?\d+\s*")
+_FLOAT_RE = re.compile(r"\s*-?\d+(\.\d+)?\s*")
+
+
+def classify(value: str) -> Tuple[str, Any]:
+    """
+    Classify an INI value for the editor: ("bool", bool), ("color", QColor),
+    ("int", int), ("float", float) or ("str", value).
+
+    The first character picks the only checks that can succeed, so most values
+    cost a single test instead of every parser in turn.
+    """
+    t = value.strip()
+    if not t:
+        return "str", value
+    c = t[0]
+    b = _is_bool_text(t)
+    if b is not None:
+        return "bool", b
+    if c == "0" and t[1:2] in ("x", "X"):
+        color = _parse_hex_color(t)
+        if color is not None:
+            return "color", color
+        iv = _parse_int(t)
+        return ("int", iv) if iv is not None else ("str", value)
+    if c == "-" or c.isdigit():
+        if _INT_RE.fullmatch(t):
+            return "int", int(t, 10)
+        if _FLOAT_RE.fullmatch(t):
+            return "float", float(t)
+    return "str", value
+
+
 def _to_hex_color(c: QColor, keep_alpha: bool) -> str:
+    argb = c.rgba()  # 0xAARRGGBB
     if keep_alpha:
-        return f"0x{c.alpha():02X}{c.red():02X}{c.green():02X}{c.blue():02X}"
-    return f"0x{c.red():02X}{c.green():02X}{c.blue():02X}"
+        return f"0x{argb:08X}"
+    return f"0x{argb & 0xFFFFFF:06X}"
 
 
 @dataclass
@@ -135,6 +175,10 @@ class IniValueRef:
     suffix: str
 
 
+def _ref_sort_key(ref: IniValueRef) -> Tuple[str, str]:
+    return ref.section.lower(), ref.key.lower()
+
+
 class IniDocument:
     """
     Minimal INI editor that preserves file lines and updates key=value lines in place.
@@ -146,53 +190,144 @@ class IniDocument:
 
     def __init__(self, path: str) -> None:
         self.path = path
-        self.lines: List[str] = []
+        self._lines: Optional[List[str]] = []
         self.refs: Dict[Tuple[str, str], IniValueRef] = {}
         self.section_order: List[str] = []
+        # section -> refs in that section / line index of its first [section] header
+        self._by_section: Dict[str, List[IniValueRef]] = {}
+        self._section_line_idx: Dict[str, int] = {}
+        # Line index of every [section] header, ascending
+        self._section_header_lines: List[int] = []
+        # all_items() order, kept sorted; _sort_keys[i] is _ref_sort_key(_sorted_refs[i])
+        self._sorted_refs: List[IniValueRef] = []
+        self._sort_keys: List[Tuple[str, str]] = []
+        self._newline = "\n"
+        # (st_mtime_ns, st_size) of the file as last scanned or written
+        self._stamp: Tuple[int, int] = (0, 0)
+        self._dirty = False
         self._loaded = False
 
+    @property
+    def lines(self) -> List[str]:
+        # Decoded lines are only needed to edit/save; build them on first use
+        if self._lines is None:
+            self._materialize_lines()
+        return self._lines
+
     def load(self) -> None:
         if not os.path.isfile(self.path):
             raise FileNotFoundError(self.path)
 
-        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
-            self.lines = f.read().splitlines(True)  # keep newlines
+        fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            st = os.fstat(fd)
+            # mmap cannot map an empty file
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ) if st.st_size else None
+        finally:
+            os.close(fd)
+
+        try:
+            self._scan(mm if mm is not None else b"")
+        finally:
+            # Close right away: an open mapping keeps the file locked on Windows
+            if mm is not None:
+                mm.close()
+
+        self._stamp = (st.st_mtime_ns, st.st_size)
+        self._lines = None
+        self._dirty = False
+        self._loaded = True
 
+    def _scan(self, data) -> None:
         self.refs.clear()
         self.section_order.clear()
+        self._section_line_idx.clear()
+        header_lines = self._section_header_lines = []
 
         current_section = ""
         seen_sections = set()
 
-        for idx, raw in enumerate(self.lines):
-            sm = _SECTION_RE.match(raw)
-            if sm:
-                current_section = _norm_section(sm.group("section"))
+        # Single pass over the raw bytes: locate each line with find() and classify it
+        # with plain byte checks; only section names, keys and values get decoded.
+        size = len(data)
+        pos = 0
+        idx = 0
+        while pos < size:
+            nl = data.find(b"\n", pos)
+            end = size if nl == -1 else nl
+            raw = data[pos:end]
+            pos = end + 1
+            line_idx = idx
+            idx += 1
+
+            if raw.endswith(b"\r"):
+                raw = raw[:-1]
+
+            # [section]
+            stripped = raw.strip()
+            if stripped[:1] == b"[" and stripped[-1:] == b"]" and len(stripped) > 2 and b"]" not in stripped[1:-1]:
+                current_section = _norm_section(_decode(stripped[1:-1]))
+                header_lines.append(line_idx)
                 if current_section not in seen_sections:
                     self.section_order.append(current_section)
                     seen_sections.add(current_section)
+                    self._section_line_idx[current_section] = line_idx
                 continue
 
-            km = _KEYVAL_RE.match(raw)
-            if not km:
+            # key = value (comments starting with ';' never have a key)
+            eq = raw.find(b"=")
+            if eq <= 0:
+                continue
+            head = raw[:eq]
+            key_bytes = head.strip()
+            if not key_bytes or b";" in head or b"\r" in head:
                 continue
+            tail = raw[eq + 1:]
+            val_bytes = tail.strip()
+            prefix = head[: len(head) - len(head.lstrip())]
+            suffix = tail[len(tail.rstrip()):] if val_bytes else b""
 
-            key = _norm_key(km.group("key"))
-            val = km.group("val").rstrip("\r\n")
-            prefix = km.group("prefix")
-            suffix = km.group("suffix")
             s = _norm_section(current_section)
+            key = _norm_key(_decode(key_bytes))
 
             self.refs[(s, key)] = IniValueRef(
                 section=s,
                 key=key,
-                value=val,
-                line_index=idx,
-                prefix=prefix,
-                suffix=suffix,
+                value=_decode(val_bytes),
+                line_index=line_idx,
+                prefix=_decode(prefix),
+                suffix=_decode(suffix),
             )
 
-        self._loaded = True
+        # Built from refs so duplicate keys resolve the same way (last one wins)
+        by_section: Dict[str, List[IniValueRef]] = {}
+        for ref in self.refs.values():
+            by_section.setdefault(ref.section, []).append(ref)
+        self._by_section = by_section
+
+        self._sorted_refs = sorted(self.refs.values(), key=_ref_sort_key)
+        self._sort_keys = [_ref_sort_key(r) for r in self._sorted_refs]
+
+        # Line ending used for keys added by set()
+        first_nl = data.find(b"\n")
+        self._newline = "\r\n" if first_nl > 0 and data[first_nl - 1] == 0x0D else "\n"
+
+    def _materialize_lines(self) -> None:
+        st = os.stat(self.path)
+        if (st.st_mtime_ns, st.st_size) != self._stamp:
+            # Changed on disk since load(): rescan so ref line indices match the lines
+            self.load()
+        with open(self.path, "rb") as f:
+            self._lines = _split_lines(_decode(f.read()))
+
+    def reload_if_changed(self) -> bool:
+        """Reload only if the file changed on disk since the last load/save. Returns True if reloaded."""
+        if self._loaded:
+            st = os.stat(self.path)
+            if (st.st_mtime_ns, st.st_size) == self._stamp:
+                return False
+        self.load()
+        return True
 
     def sections(self) -> List[str]:
         self._ensure_loaded()
@@ -200,16 +335,14 @@ class IniDocument:
 
     def items(self, section: str) -> List[Tuple[str, str]]:
         self._ensure_loaded()
-        s = _norm_section(section)
-        out = [(k, ref.value) for (sec, k), ref in self.refs.items() if sec == s]
+        refs = self._by_section.get(_norm_section(section), [])
+        out = [(ref.key, ref.value) for ref in refs]
         out.sort(key=lambda kv: kv[0].lower())
         return out
 
     def all_items(self) -> List[IniValueRef]:
         self._ensure_loaded()
-        refs = list(self.refs.values())
-        refs.sort(key=lambda r: (r.section.lower(), r.key.lower()))
-        return refs
+        return list(self._sorted_refs)
 
     def get(self, section: str, key: str) -> Optional[str]:
         self._ensure_loaded()
@@ -218,14 +351,19 @@ class IniDocument:
 
     def set(self, section: str, key: str, value: str) -> None:
         self._ensure_loaded()
+        lines = self.lines  # materialize (and rescan if stale) before using refs
         s = _norm_section(section)
         k = _norm_key(key)
         t = (s, k)
         if t in self.refs:
             ref = self.refs[t]
             ref.value = value
-            newline = "\n" if self.lines[ref.line_index].endswith("\n") else ""
-            self.lines[ref.line_index] = f"{ref.prefix}{ref.key}={value}{ref.suffix}{newline}"
+            old_line = lines[ref.line_index]
+            newline = old_line[len(old_line.rstrip("\r\n")):]
+            new_line = f"{ref.prefix}{ref.key}={value}{ref.suffix}{newline}"
+            if new_line != old_line:
+                lines[ref.line_index] = new_line
+                self._dirty = True
             return
 
         # Add new key under section (append near end of section; simplest: append at file end if section not found)
@@ -234,49 +372,67 @@ class IniDocument:
         if section_line_idx is not None:
             insert_at = self._find_section_end_index(section_line_idx + 1)
 
-        line = f"{k}={value}\n"
+        # Appending after a last line that has no line ending: terminate it first
+        if insert_at > 0 and not self.lines[insert_at - 1].endswith("\n"):
+            self.lines[insert_at - 1] += self._newline
+
+        line = f"{k}={value}{self._newline}"
         self.lines.insert(insert_at, line)
-        self.refs[t] = IniValueRef(
-            section=s, key=k, value=value, line_index=insert_at, prefix="", suffix=""
-        )
+        self._dirty = True
         self._reindex_refs_from(insert_at)
+        ref = IniValueRef(section=s, key=k, value=value, line_index=insert_at, prefix="", suffix="")
+        self.refs[t] = ref
+        self._by_section.setdefault(s, []).append(ref)
+        sort_key = _ref_sort_key(ref)
+        pos = bisect_right(self._sort_keys, sort_key)
+        self._sort_keys.insert(pos, sort_key)
+        self._sorted_refs.insert(pos, ref)
 
         if s and s not in self.section_order:
             self.section_order.append(s)
 
     def save(self) -> None:
         self._ensure_loaded()
-        with open(self.path, "w", encoding="utf-8", errors="replace") as f:
-            f.writelines(self.lines)
+        if not self._dirty:
+            return
+        # Lines keep their original endings, so no newline translation on write.
+        # One write into a sibling file swapped in afterwards: a crash never leaves a
+        # truncated INI behind
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", errors="replace", newline="", buffering=1 << 20) as f:
+                f.write("".join(self.lines))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        st = os.stat(self.path)
+        self._stamp = (st.st_mtime_ns, st.st_size)
+        self._dirty = False
 
     def _find_section_line_index(self, section: str) -> Optional[int]:
-        want = _norm_section(section)
-        current = ""
-        for idx, raw in enumerate(self.lines):
-            sm = _SECTION_RE.match(raw)
-            if sm:
-                current = _norm_section(sm.group("section"))
-                if current == want:
-                    return idx
-        return None
+        return self._section_line_idx.get(_norm_section(section))
 
     def _find_section_end_index(self, start_idx: int) -> int:
-        for i in range(start_idx, len(self.lines)):
-            if _SECTION_RE.match(self.lines[i]):
-                return i
-        return len(self.lines)
+        # First header at or after start_idx, else end of file
+        headers = self._section_header_lines
+        i = bisect_right(headers, start_idx - 1)
+        return headers[i] if i < len(headers) else len(self.lines)
 
     def _reindex_refs_from(self, start_idx: int) -> None:
-        # After insertion, shift any stored line indices >= start_idx
+        # A line was inserted at start_idx: shift every stored line index at or after it
         for ref in self.refs.values():
-            if ref.line_index >= start_idx and self.lines[ref.line_index] is not self.lines[start_idx]:
-                pass
-        # Safer: rebuild mapping of line_index by re-parsing (still preserves lines)
-        # This is simpler and avoids tricky shifts.
-        path = self.path
-        self._loaded = False
-        self.load()
-        self.path = path
+            if ref.line_index >= start_idx:
+                ref.line_index += 1
+        for sec, idx in self._section_line_idx.items():
+            if idx >= start_idx:
+                self._section_line_idx[sec] = idx + 1
+        headers = self._section_header_lines
+        for i in range(bisect_right(headers, start_idx - 1), len(headers)):
+            headers[i] += 1
 
     def _ensure_loaded(self) -> None:
         if not self._loaded:
@@ -289,13 +445,10 @@ class ColorEditor(QWidget):
         self._keep_alpha = False
         self._color = QColor()
 
-        m = _HEX_COLOR_RE.match(initial_text or "")
-        if m:
-            hx = m.group("hex")
-            self._keep_alpha = len(hx) == 8
-            c = _parse_hex_color(initial_text)
-            if c is not None:
-                self._color = c
+        c = _parse_hex_color(initial_text or "")
+        if c is not None:
+            self._keep_alpha = len(initial_text.strip()) == 10  # 0xAARRGGBB
+            self._color = c
 
         self.line = QLineEdit(initial_text)
         self.btn = QToolButton()
@@ -326,11 +479,52 @@ class ColorEditor(QWidget):
         return self.line.text()
 
 
+def _build_bool(parsed: bool, value: str) -> QWidget:
+    cb = QCheckBox()
+    cb.setChecked(parsed)
+    return cb
+
+
+def _build_color(parsed: QColor, value: str) -> QWidget:
+    return ColorEditor(value)
+
+
+def _build_int(parsed: int, value: str) -> QWidget:
+    sp = QSpinBox()
+    sp.setRange(-2_147_483_648, 2_147_483_647)
+    sp.setValue(parsed)
+    return sp
+
+
+def _build_float(parsed: float, value: str) -> QWidget:
+    dsp = QDoubleSpinBox()
+    dsp.setDecimals(6)
+    dsp.setRange(-1e12, 1e12)
+    dsp.setValue(parsed)
+    return dsp
+
+
+def _build_str(parsed: str, value: str) -> QWidget:
+    return QLineEdit(value)
+
+
+# classify() kind -> builder(parsed, raw value) returning the configured editor widget
+_BUILDERS: Dict[str, Callable[[Any, str], QWidget]] = {
+    "bool": _build_bool,
+    "color": _build_color,
+    "int": _build_int,
+    "float": _build_float,
+    "str": _build_str,
+}
+
+
 class IniEditorWidget(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self.doc: Optional[IniDocument] = None
         self._controls: Dict[Tuple[str, str], QWidget] = {}
+        # Control values right after the form was built, to detect unsaved edits
+        self._initial_values: Dict[Tuple[str, str], Optional[str]] = {}
 
         self.header = QLabel("Selecciona un INI para editar.")
         self.header.setWordWrap(True)
@@ -338,10 +532,7 @@ class IniEditorWidget(QWidget):
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
 
-        self.form_host = QWidget()
-        self.form = QFormLayout(self.form_host)
-        self.form.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-        self.form.setFormAlignment(Qt.AlignmentFlag.AlignTop)
+        self._new_form_host()
         self.scroll.setWidget(self.form_host)
 
         self.btn_reload = QPushButton("Recargar")
@@ -364,30 +555,43 @@ class IniEditorWidget(QWidget):
 
     def set_document(self, doc: Optional[IniDocument]) -> None:
         self.doc = doc
-        self._controls.clear()
         self._clear_form()
 
         if doc is None:
             self.header.setText("Selecciona un INI para editar.")
             self.btn_save.setEnabled(False)
             self.btn_reload.setEnabled(False)
+            self.scroll.setWidget(self.form_host)
             return
 
         self.header.setText(f"Editando: {os.path.basename(doc.path)}")
         self.btn_save.setEnabled(True)
         self.btn_reload.setEnabled(True)
 
-        for ref in doc.all_items():
-            self._add_control(ref.section, ref.key, ref.value)
+        # Fill the host while it is detached and not painting, then attach it once:
+        # one layout pass for the whole form instead of one per added row
+        self.form_host.setUpdatesEnabled(False)
+        self.form.setEnabled(False)
+        try:
+            for ref in doc.all_items():
+                self._add_control(ref.section, ref.key, ref.value)
+        finally:
+            self.form.setEnabled(True)
+            self.form_host.setUpdatesEnabled(True)
+            self.scroll.setWidget(self.form_host)
+        self._snapshot_values()
 
     def reload(self) -> None:
         if not self.doc:
             return
         try:
-            self.doc.load()
+            changed = self.doc.reload_if_changed()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"No se pudo recargar:\n{e}")
             return
+        # Same file on disk and nothing edited in the form: the widgets are already current
+        if not changed and not self._has_unsaved_edits():
+            return
         self.set_document(self.doc)
 
     def save(self) -> None:
@@ -399,11 +603,21 @@ class IniEditorWidget(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"No se pudo guardar:\n{e}")
             return
+        self._snapshot_values()
         QMessageBox.information(self, "OK", "Guardado correctamente.")
 
+    def _new_form_host(self) -> None:
+        self.form_host = QWidget()
+        self.form = QFormLayout(self.form_host)
+        self.form.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+        self.form.setFormAlignment(Qt.AlignmentFlag.AlignTop)
+
     def _clear_form(self) -> None:
-        while self.form.rowCount():
-            self.form.removeRow(0)
+        # Start a new, still detached host instead of removeRow(0) per row (quadratic
+        # on big INIs); set_document() attaches it, which deletes the old host
+        self._controls = {}
+        self._initial_values = {}
+        self._new_form_host()
 
     def _add_section_divider(self, title: str) -> None:
         line = QFrame()
@@ -423,63 +637,44 @@ class IniEditorWidget(QWidget):
             self._controls[(section, "")] = QLabel("")  # marker
             self._add_section_divider(section if section else "GLOBAL")
 
-        widget: QWidget
-
-        b = _is_bool_text(value)
-        if b is not None:
-            cb = QCheckBox()
-            cb.setChecked(b)
-            widget = cb
-        else:
-            color = _parse_hex_color(value)
-            if color is not None:
-                widget = ColorEditor(value)
-            else:
-                iv = _parse_int(value)
-                fv = _parse_float(value)
-
-                if iv is not None and (value.strip().lower().startswith("0x") or re.fullmatch(r"\s*-?\d+\s*", value)):
-                    sp = QSpinBox()
-                    sp.setRange(-2_147_483_648, 2_147_483_647)
-                    sp.setValue(iv)
-                    widget = sp
-                elif fv is not None and re.fullmatch(r"\s*-?\d+(\.\d+)?\s*", value):
-                    dsp = QDoubleSpinBox()
-                    dsp.setDecimals(6)
-                    dsp.setRange(-1e12, 1e12)
-                    dsp.setValue(fv)
-                    widget = dsp
-                else:
-                    le = QLineEdit(value)
-                    widget = le
-
-        widget.setProperty("ini_section", section)
-        widget.setProperty("ini_key", key)
+        kind, parsed = classify(value)
+        widget = _BUILDERS[kind](parsed, value)
 
+        # (section, key) lives in _controls; no per-widget dynamic properties needed
         self._controls[(section, key)] = widget
         self.form.addRow(QLabel(key), widget)
 
+    @staticmethod
+    def _control_value(w: QWidget) -> Optional[str]:
+        if isinstance(w, QCheckBox):
+            return "true" if w.isChecked() else "false"
+        if isinstance(w, QSpinBox):
+            return str(w.value())
+        if isinstance(w, QDoubleSpinBox):
+            # Keep compact formatting, similar to INI conventions
+            v = w.value()
+            return str(int(v)) if abs(v - int(v)) < 1e-12 else f"{v:.6f}".rstrip("0").rstrip(".")
+        if isinstance(w, ColorEditor):
+            return w.text().strip()
+        if isinstance(w, QLineEdit):
+            return w.text()
+        return None
+
+    def _snapshot_values(self) -> None:
+        self._initial_values = {t: self._control_value(w) for t, w in self._controls.items()}
+
+    def _has_unsaved_edits(self) -> bool:
+        initial = self._initial_values
+        return any(self._control_value(w) != initial.get(t) for t, w in self._controls.items())
+
     def _apply_controls_to_doc(self) -> None:
         assert self.doc is not None
         for (section, key), w in self._controls.items():
             if key == "":
                 continue
-
-            if isinstance(w, QCheckBox):
-                new_val = "true" if w.isChecked() else "false"
-            elif isinstance(w, QSpinBox):
-                new_val = str(w.value())
-            elif isinstance(w, QDoubleSpinBox):
-                # Keep compact formatting, similar to INI conventions
-                v = w.value()
-                new_val = str(int(v)) if abs(v - int(v)) < 1e-12 else f"{v:.6f}".rstrip("0").rstrip(".")
-            elif isinstance(w, ColorEditor):
-                new_val = w.text().strip()
-            elif isinstance(w, QLineEdit):
-                new_val = w.text()
-            else:
+            new_val = self._control_value(w)
+            if new_val is None:
                 continue
-
             self.doc.set(section, key, new_val)
 
 
@@ -498,6 +693,12 @@ class HyperSpinTab(QWidget):
     def __init__(self, status: QStatusBar, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self.status = status
+        # folder -> (st_mtime_ns, sorted .ini names); the folder mtime changes whenever
+        # an entry is added, removed or renamed
+        self._dir_cache: Dict[str, Tuple[int, List[str]]] = {}
+        # path -> loaded document; Sistemas X INIs are parsed into it in the background
+        self._doc_cache: Dict[str, IniDocument] = {}
+        self._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
 
         self.settings_path = QLineEdit()
         self.btn_browse = QPushButton("Buscar…")
@@ -547,13 +748,27 @@ class HyperSpinTab(QWidget):
 
     def _list_ini_files(self) -> List[str]:
         folder = self.settings_path.text().strip()
-        if not folder or not os.path.isdir(folder):
+        if not folder:
+            return []
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
             return []
+        cached = self._dir_cache.get(folder)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
         files = []
-        for name in os.listdir(folder):
-            if name.lower().endswith(".ini") and os.path.isfile(os.path.join(folder, name)):
-                files.append(name)
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    # scandir already carries the file type: no extra stat per entry
+                    if entry.name.lower().endswith(".ini") and entry.is_file():
+                        files.append(entry.name)
+        except OSError:
+            return []
         files.sort(key=lambda s: s.lower())
+        self._dir_cache[folder] = (mtime_ns, files)
         return files
 
     def _refresh_lists(self) -> None:
@@ -597,6 +812,25 @@ class HyperSpinTab(QWidget):
         self.system_combo.blockSignals(False)
         self._load_selected_ini()
 
+        if category == "Sistemas X":
+            self._prewarm_systems(systems)
+
+    def _prewarm_systems(self, names: List[str]) -> None:
+        folder = self.settings_path.text().strip()
+        paths = [os.path.join(folder, n) for n in names]
+        pending = [p for p in paths if p not in self._doc_cache]
+        if pending:
+            self._pool.map(self._prewarm, pending)
+
+    def _prewarm(self, path: str) -> None:
+        # Runs in the pool: IniDocument.load() touches no Qt objects
+        doc = IniDocument(path)
+        try:
+            doc.load()
+        except Exception:
+            return  # reported normally if the user selects this file
+        self._doc_cache.setdefault(path, doc)
+
     def _selected_ini_path(self) -> Optional[str]:
         folder = self.settings_path.text().strip()
         if not folder or not os.path.isdir(folder):
@@ -627,8 +861,13 @@ class HyperSpinTab(QWidget):
             return
 
         try:
-            doc = IniDocument(path)
-            doc.load()
+            doc = self._doc_cache.get(path)
+            if doc is None:
+                doc = IniDocument(path)
+                doc.load()
+                self._doc_cache[path] = doc
+            else:
+                doc.reload_if_changed()
         except Exception as e:
             self.editor.set_document(None)
             QMessageBox.critical(self, "Error", f"No se pudo abrir:\n{path}\n\n{e}")
@@ -1,47 +1,113 @@
+import io
+import os
 import sys
 import json
+import functools
 import re
 import shutil
 import subprocess
+# ElementTree already runs on its C accelerator (_elementtree) since Python 3.3;
+# xml.etree.cElementTree was only a deprecated alias and is gone since 3.9
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 
+# lxml is optional: its iterparse is faster; the stdlib one is the fallback
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+# pyahocorasick is optional: one automaton pass per path instead of testing every prefix
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 SETTINGS_FILE = "settings.json"
+# Settings changes are coalesced and written this long after the last one
+SETTINGS_SAVE_DELAY_MS = 500
+# Parsed profile fields keyed by XML path, reused while (mtime, size) match.
+# Bump the version whenever the cached fields or their meaning change.
+PROFILES_CACHE_FILE = "profiles_cache.json"
+PROFILES_CACHE_VERSION = 1
+# Profile XMLs are small files: parsing them is mostly I/O wait, so use more threads than cores
+PROFILE_SCAN_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+# Concurrent .bat writes, to overlap per-file latency on slow or network folders
+BAT_WRITE_WORKERS = 8
 
 
 # -----------------------
 # Utilities
 # -----------------------
+# Windows invalid chars + control chars
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*\x00-\x1F]')
+
+
 def sanitize_filename(name: str) -> str:
     if not name:
         return ""
-    # Windows invalid chars + control chars
-    return re.sub(r'[<>:"/\\|?*\x00-\x1F]', "_", name).strip()
+    return _SANITIZE_RE.sub("_", name).strip()
 
 
-def extract_xml_node_text(xml_path: Path, node_name: str) -> Optional[str]:
+def write_bytes_file(path: str, data: bytes) -> Optional[Exception]:
+    # Returns the error instead of raising, so it can run in a pool and be logged afterwards
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        # Try direct find first
-        el = root.find(f".//{node_name}")
-        if el is None:
-            # case-insensitive fallback
-            for n in root.iter():
-                tag = getattr(n, "tag", "")
-                if isinstance(tag, str) and tag.lower().endswith(node_name.lower()):
-                    el = n
-                    break
-        if el is not None and el.text:
-            return el.text.strip()
-    except Exception:
-        pass
+        with open(path, "wb", buffering=64 * 1024) as f:
+            f.write(data)
+    except OSError as e:
+        return e
     return None
 
 
+def extract_xml_nodes_text(xml_path: Path, node_names: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """
+    Streaming lookup of several nodes in one pass. Parsing stops as soon as every
+    name has been seen with its exact tag, so the large config/joystick sections
+    of a profile are never built. A node matching only case-insensitively (or by
+    namespace suffix) is used when no exact tag exists.
+    """
+    exact: Dict[str, Optional[str]] = {}
+    loose: Dict[str, Optional[str]] = {}
+    lowered = [(n, n.lower()) for n in node_names]
+    iterparse = LET.iterparse if LET is not None else ET.iterparse
+    try:
+        with open(xml_path, "rb") as f:
+            for _event, el in iterparse(f, events=("end",)):
+                tag = el.tag
+                if isinstance(tag, str):
+                    tag_l = tag.lower()
+                    for name, name_l in lowered:
+                        if tag == name:
+                            exact.setdefault(name, el.text)
+                        elif name not in loose and tag_l.endswith(name_l):
+                            loose[name] = el.text
+                    if len(exact) == len(lowered):
+                        break
+                el.clear()
+    except Exception:
+        return {n: None for n in node_names}
+
+    out: Dict[str, Optional[str]] = {}
+    for name in node_names:
+        text = exact[name] if name in exact else loose.get(name)
+        out[name] = text.strip() if text else None
+    return out
+
+
+def extract_xml_node_text(xml_path: Path, node_name: str) -> Optional[str]:
+    return extract_xml_nodes_text(xml_path, (node_name,))[node_name]
+
+
+def extract_profile_fields(xml_path: Path) -> Tuple[str, Optional[str]]:
+    # (GameNameInternal or file stem, GamePath) from a single pass over the XML
+    found = extract_xml_nodes_text(xml_path, ("GameNameInternal", "GamePath"))
+    return found["GameNameInternal"] or xml_path.stem, found["GamePath"]
+
+
 def extract_gamename_internal(xml_path: Path) -> str:
     name = extract_xml_node_text(xml_path, "GameNameInternal")
     return name if name else xml_path.stem
@@ -51,11 +117,17 @@ def extract_gamepath(xml_path: Path) -> Optional[str]:
     return extract_xml_node_text(xml_path, "GamePath")
 
 
+@functools.lru_cache(maxsize=4096)
+def _norm_path(p: str) -> str:
+    # Interned: profiles sharing a game path share one string
+    return sys.intern(p.replace("/", "\\").lower())
+
+
 def norm_path_for_match(p: Optional[str]) -> str:
     if not p:
         return ""
     # Normalize separators and lower-case for comparison
-    return p.replace("/", "\\").lower()
+    return _norm_path(p)
 
 
 # -----------------------
@@ -92,14 +164,176 @@ def build_static_categories() -> List[Tuple[str, List[str]]]:
 # Profile model
 # -----------------------
 class ProfileItem:
-    def __init__(self, xml_path: Path):
+    def __init__(self, xml_path: Path, fields: Optional[Tuple[str, Optional[str]]] = None):
+        # fields: (name, gamepath) already known (profiles cache); parsed from the XML otherwise
         self.xml_path = xml_path
-        self.name = extract_gamename_internal(xml_path)
-        self.gamepath = extract_gamepath(xml_path) or ""
+        self.stem = xml_path.stem  # ShortName / fallback file name, computed once
+        name, gamepath = fields if fields is not None else extract_profile_fields(xml_path)
+        self.name = name.strip()
+        self.gamepath = gamepath or ""
         self.gamepath_norm = norm_path_for_match(self.gamepath)
         self.category = ""  # will be filled later based on static categories
 
 
+# -----------------------
+# Table model: reads straight from the visible ProfileItem list
+# -----------------------
+class ProfileTableModel(QtCore.QAbstractTableModel):
+    HEADERS = ("Name", "Category", "GamePath", "XML Path", "Actions")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: List[ProfileItem] = []
+
+    def set_rows(self, rows: List[ProfileItem]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        prof = self.rows[index.row()]
+        col = index.column()
+        if col == 0:
+            return prof.name
+        if col == 1:
+            return prof.category or ""
+        if col == 2:
+            return prof.gamepath
+        if col == 3:
+            return str(prof.xml_path)
+        return None  # Actions: painted by ActionButtonsDelegate
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        return QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsEnabled
+
+
+# -----------------------
+# INI module editor model: (section, key, value) rows, editors only while a cell is edited
+# -----------------------
+class IniEntriesModel(QtCore.QAbstractTableModel):
+    HEADERS = ("Section", "Key", "Value")
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.rows: List[Tuple[str, str, str]] = [
+            (section, key, value) for section in config.sections() for key, value in config[section].items()
+        ]
+        self.edits: Dict[Tuple[str, str], str] = {}  # (section, key) -> new value
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
+            return None
+        section, key, value = self.rows[index.row()]
+        col = index.column()
+        if col == 0:
+            return section
+        if col == 1:
+            return key
+        return self.edits.get((section, key), value)
+
+    def setData(self, index, value, role=QtCore.Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != 2 or role != QtCore.Qt.ItemDataRole.EditRole:
+            return False
+        section, key, _value = self.rows[index.row()]
+        self.edits[(section, key)] = str(value)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        flags = QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsEnabled
+        if index.column() == 2:
+            flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+        return flags
+
+
+# -----------------------
+# Actions column: painted buttons instead of two QPushButtons per row
+# -----------------------
+class ActionButtonsDelegate(QtWidgets.QStyledItemDelegate):
+    clicked = QtCore.pyqtSignal(int, int)  # (row, index into BUTTONS)
+
+    BUTTONS = ("Play", "Create .bat")
+    _PADDING = 12
+    _SPACING = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed: Optional[Tuple[int, int]] = None
+
+    def _button_rects(self, option) -> List[QtCore.QRect]:
+        fm = option.fontMetrics
+        r = option.rect
+        x = r.left() + 2
+        rects = []
+        for text in self.BUTTONS:
+            w = fm.horizontalAdvance(text) + 2 * self._PADDING
+            rects.append(QtCore.QRect(x, r.top() + 1, w, r.height() - 2))
+            x += w + self._SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)  # background / selection
+        widget = option.widget
+        style = widget.style() if widget else QtWidgets.QApplication.style()
+        for text, rect in zip(self.BUTTONS, self._button_rects(option)):
+            btn = QtWidgets.QStyleOptionButton()
+            btn.rect = rect
+            btn.text = text
+            btn.state = QtWidgets.QStyle.StateFlag.State_Enabled | QtWidgets.QStyle.StateFlag.State_Raised
+            style.drawControl(QtWidgets.QStyle.ControlElement.CE_PushButton, btn, painter, widget)
+
+    def sizeHint(self, option, index):
+        fm = option.fontMetrics
+        width = 4 + sum(fm.horizontalAdvance(t) + 2 * self._PADDING for t in self.BUTTONS)
+        return QtCore.QSize(width + self._SPACING * (len(self.BUTTONS) - 1), fm.height() + 12)
+
+    def editorEvent(self, event, model, option, index):
+        etype = event.type()
+        if etype not in (QtCore.QEvent.Type.MouseButtonPress, QtCore.QEvent.Type.MouseButtonDblClick,
+                         QtCore.QEvent.Type.MouseButtonRelease):
+            return False
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return False
+        pos = event.position().toPoint()
+        hit = next((i for i, r in enumerate(self._button_rects(option)) if r.contains(pos)), None)
+        if etype == QtCore.QEvent.Type.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            if hit is not None and pressed == (index.row(), hit):
+                self.clicked.emit(index.row(), hit)
+        else:
+            self._pressed = None if hit is None else (index.row(), hit)
+        # Clicks on a button are consumed (no row selection), like the old QPushButtons
+        return hit is not None
+
+
 # -----------------------
 # Main window
 # -----------------------
@@ -111,7 +345,10 @@ class TeknoManager(QtWidgets.QWidget):
 
         # State
         self.profiles: List[ProfileItem] = []
+        self._profiles_cache: Optional[dict] = None  # loaded from PROFILES_CACHE_FILE on first refresh
         self.categories = build_static_categories()  # list of (display_text, [prefixes])
+        self._build_category_matcher()
+        self._combo_min_width: Optional[int] = None  # drop-down width for self.categories, measured once
         self.settings = {
             "exe": "",
             "userprofiles": "",
@@ -121,6 +358,14 @@ class TeknoManager(QtWidgets.QWidget):
             "last_category": "Todas",
             "last_ini": ""
         }
+        self._last_saved_json: Optional[str] = None  # what SETTINGS_FILE currently holds
+        # (exe, args before --profile, args after it); None until the next launch rebuilds it
+        self._launch_ctx: Optional[Tuple[str, List[str], List[str]]] = None
+
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SETTINGS_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._do_save_settings)
 
         # UI build
         self._build_ui()
@@ -190,14 +435,19 @@ class TeknoManager(QtWidgets.QWidget):
         self._populate_category_combo()
 
         # Table
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Name", "Category", "GamePath", "XML Path", "Actions"])
+        self.table_model = ProfileTableModel(self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.table_model)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(3, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(4, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.actions_delegate = ActionButtonsDelegate(self.table)
+        self.actions_delegate.clicked.connect(self._on_action_clicked)
+        self.table.setItemDelegateForColumn(4, self.actions_delegate)
         layout.addWidget(self.table, 1)
 
         # Buttons row
@@ -233,6 +483,10 @@ class TeknoManager(QtWidgets.QWidget):
 
         # Connect combo change
         self.category_combo.currentIndexChanged.connect(self.on_category_changed)
+        # Launch options changed: rebuild the launch arguments on the next Play
+        self.exe_line.textChanged.connect(self._invalidate_launch_ctx)
+        self.start_min_cb.toggled.connect(self._invalidate_launch_ctx)
+        self.extra_args_line.textChanged.connect(self._invalidate_launch_ctx)
 
     # -----------------------
     # Category combo helpers
@@ -240,22 +494,53 @@ class TeknoManager(QtWidgets.QWidget):
     def _populate_category_combo(self):
         self.category_combo.clear()
         # Fill with display text in order defined in categories list
-        for display, _prefixes in self.categories:
-            self.category_combo.addItem(display)
-        # Adjust drop-down width to longest item
-        fm = self.category_combo.fontMetrics()
-        maxw = 0
-        for i in range(self.category_combo.count()):
-            txt = self.category_combo.itemText(i)
-            w = fm.horizontalAdvance(txt)
-            if w > maxw:
-                maxw = w
-        # add some padding
+        self.category_combo.addItems([display for display, _prefixes in self.categories])
+        # Adjust drop-down width to longest item (plus some padding); text shaping is only
+        # done the first time, reset _combo_min_width to None if self.categories changes
+        if self._combo_min_width is None:
+            fm = self.category_combo.fontMetrics()
+            self._combo_min_width = max((fm.horizontalAdvance(d) for d, _ in self.categories), default=0) + 60
         try:
-            self.category_combo.view().setMinimumWidth(maxw + 60)
+            self.category_combo.view().setMinimumWidth(self._combo_min_width)
         except Exception:
             pass
 
+    def _build_category_matcher(self):
+        # Call again whenever self.categories changes.
+        # (prefix, trimmed display text), longest first; the stable sort keeps category order
+        # among equal lengths, so the first hit is always the most specific match
+        flat = [(pref, display_text.strip()) for display_text, prefixes in self.categories for pref in prefixes if pref]
+        flat.sort(key=lambda t: -len(t[0]))
+        self._flat_prefixes: List[Tuple[str, str]] = flat
+
+        self._category_automaton = None
+        if ahocorasick is None:
+            return
+        A = ahocorasick.Automaton()
+        for order, (display_text, prefixes) in enumerate(self.categories):
+            for pref in prefixes:
+                # First category listing a prefix keeps it, as in the plain loop
+                if pref and not A.exists(pref):
+                    A.add_word(pref, (len(pref), -order, display_text.strip()))
+        if len(A):
+            A.make_automaton()
+            self._category_automaton = A
+
+    def _match_category(self, gamepath_norm: str) -> Optional[str]:
+        # Category (display text trimmed of indentation) of the longest prefix contained in the
+        # path; on equal length the earlier category wins
+        if self._category_automaton is not None:
+            best = None
+            for _end, value in self._category_automaton.iter(gamepath_norm):
+                if best is None or value[:2] > best[:2]:
+                    best = value
+            return best[2] if best else None
+
+        for pref, display in self._flat_prefixes:
+            if pref in gamepath_norm:
+                return display
+        return None
+
     def _category_prefixes_for_index(self, index: int) -> List[str]:
         if index < 0 or index >= len(self.categories):
             return []
@@ -271,6 +556,10 @@ class TeknoManager(QtWidgets.QWidget):
     # Settings JSON
     # -----------------------
     def save_settings(self):
+        # Called after every action: (re)start the timer so a burst of calls ends in one write
+        self._save_timer.start()
+
+    def _do_save_settings(self):
         try:
             self.settings.update({
                 "exe": self.exe_line.text().strip(),
@@ -280,12 +569,26 @@ class TeknoManager(QtWidgets.QWidget):
                 "extra_args": self.extra_args_line.text().strip(),
                 "last_category": self.category_combo.currentText() if self.category_combo.count() > 0 else self.settings.get("last_category", "Todas")
             })
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=4)
+            data = json.dumps(self.settings, indent=4)
+            if data == self._last_saved_json:
+                return
+            # Write a sibling file and swap it in so settings.json is never left half-written
+            tmp_file = SETTINGS_FILE + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_file, SETTINGS_FILE)
+            self._last_saved_json = data
             self.log_msg("Settings saved to", SETTINGS_FILE)
         except Exception as e:
             self.log_msg("Error saving settings:", e)
 
+    def closeEvent(self, event):
+        # Flush a save still waiting on the timer
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._do_save_settings()
+        super().closeEvent(event)
+
     def load_settings(self):
         if Path(SETTINGS_FILE).exists():
             try:
@@ -293,6 +596,7 @@ class TeknoManager(QtWidgets.QWidget):
                     data = json.load(f)
                 # Merge with defaults
                 self.settings.update(data)
+                self._last_saved_json = json.dumps(self.settings, indent=4)
             except Exception:
                 pass
         # Apply to UI
@@ -352,34 +656,78 @@ class TeknoManager(QtWidgets.QWidget):
             QtWidgets.QMessageBox.critical(self, "Invalid folder", f"UserProfiles folder does not exist:\n{up}")
             return
 
-        xml_files = sorted(p.glob("*.xml"))
-        self.profiles = [ProfileItem(x) for x in xml_files]
+        # scandir hands back DirEntry objects with cached type info, so listing thousands of
+        # profiles avoids glob's per-entry matching and stat calls; sorting the Paths keeps
+        # glob's order (case-insensitive on Windows)
+        with os.scandir(p) as it:
+            xml_files = sorted(Path(e.path) for e in it if e.name.lower().endswith(".xml") and e.is_file())
+        cache = self._load_profiles_cache()
+
+        def load_profile(xml_path: Path) -> Tuple[ProfileItem, Optional[dict]]:
+            # Unchanged files (same mtime and size) come from the cache without parsing
+            key = str(xml_path)
+            try:
+                st = os.stat(xml_path)
+            except OSError:
+                return ProfileItem(xml_path), None
+            entry = cache.get(key)
+            if entry and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                return ProfileItem(xml_path, (entry["name"], entry["gamepath"])), entry
+            prof = ProfileItem(xml_path)
+            return prof, {"mtime": st.st_mtime_ns, "size": st.st_size, "name": prof.name, "gamepath": prof.gamepath}
+
+        # ProfileItem() only reads its own file, so profiles can be parsed concurrently;
+        # map() keeps the sorted order
+        with ThreadPoolExecutor(max_workers=PROFILE_SCAN_WORKERS) as ex:
+            loaded = list(ex.map(load_profile, xml_files))
+        self.profiles = [prof for prof, _entry in loaded]
+
+        # Keep entries of other UserProfiles folders; replace this folder's with the scan
+        folder = str(p)
+        new_cache = {k: v for k, v in cache.items() if os.path.dirname(k) != folder}
+        for prof, entry in loaded:
+            if entry is not None:
+                new_cache[str(prof.xml_path)] = entry
+        self._save_profiles_cache(new_cache)
 
         # Assign categories based on static prefixes. If multiple prefixes match, prefer the longest match (more specific).
         for prof in self.profiles:
-            prof.category = "Sin categoría"
-            best_prefix = ""
-            for display_text, prefixes in self.categories:
-                for pref in prefixes:
-                    # match: if prof.gamepath_norm contains prefix
-                    if pref and pref in prof.gamepath_norm:
-                        # prefer longer (more specific) prefix
-                        if len(pref) > len(best_prefix):
-                            best_prefix = pref
-                            # map display_text trimmed (remove indentation)
-                            prof.category = display_text.strip()
             # If nothing matched, category remains "Sin categoría"
+            prof.category = self._match_category(prof.gamepath_norm) or "Sin categoría"
 
         self.log_msg(f"Found {len(self.profiles)} profiles")
         self.count_label.setText(f"Profiles: {len(self.profiles)}")
         self.populate_table()
         self.save_settings()
 
+    def _load_profiles_cache(self) -> dict:
+        if self._profiles_cache is None:
+            self._profiles_cache = {}
+            try:
+                with open(PROFILES_CACHE_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == PROFILES_CACHE_VERSION:
+                    self._profiles_cache = data.get("profiles", {})
+            except Exception:
+                pass  # missing, unreadable or old cache: everything gets reparsed
+        return self._profiles_cache
+
+    def _save_profiles_cache(self, profiles: dict):
+        if profiles == self._profiles_cache:
+            return
+        tmp_file = PROFILES_CACHE_FILE + ".tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": PROFILES_CACHE_VERSION, "profiles": profiles}, f)
+            os.replace(tmp_file, PROFILES_CACHE_FILE)
+            self._profiles_cache = profiles
+        except Exception as e:
+            self.log_msg("Error saving profiles cache:", e)
+
     # -----------------------
     # Table population based on selected category filter
     # -----------------------
     def populate_table(self):
-        self.table.setRowCount(0)
         current_idx = self.category_combo.currentIndex()
         prefixes = self._category_prefixes_for_index(current_idx)
         # If prefixes empty and selected is "Todas", show all
@@ -399,40 +747,16 @@ class TeknoManager(QtWidgets.QWidget):
         # Also handle the parent LIGHTGUN case: if user selected "LIGHTGUN" item, we used prefix lightgun games,
         # that will match everything under it (including subcategories) — that's intended.
 
-        # Fill table
+        # Fill table: the model reads the list directly, no per-cell items are created.
+        # Actions (Play, Create .bat) are painted by actions_delegate, no per-row widgets
         self._visible_profiles = visible
-        for i, prof in enumerate(visible):
-            self.table.insertRow(i)
-            name_it = QtWidgets.QTableWidgetItem(prof.name)
-            name_it.setFlags(name_it.flags() ^ QtCore.Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(i, 0, name_it)
-
-            cat = prof.category or ""
-            cat_it = QtWidgets.QTableWidgetItem(cat)
-            cat_it.setFlags(cat_it.flags() ^ QtCore.Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(i, 1, cat_it)
-
-            gp_it = QtWidgets.QTableWidgetItem(prof.gamepath)
-            gp_it.setFlags(gp_it.flags() ^ QtCore.Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(i, 2, gp_it)
-
-            xp_it = QtWidgets.QTableWidgetItem(str(prof.xml_path))
-            xp_it.setFlags(xp_it.flags() ^ QtCore.Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(i, 3, xp_it)
-
-            # Actions (Play, Create .bat)
-            w = QtWidgets.QWidget()
-            h = QtWidgets.QHBoxLayout()
-            h.setContentsMargins(0, 0, 0, 0)
-            btn_play = QtWidgets.QPushButton("Play")
-            btn_play.clicked.connect(lambda _, row=i: self._play_by_row(row))
-            btn_bat = QtWidgets.QPushButton("Create .bat")
-            btn_bat.clicked.connect(lambda _, row=i: self._create_bat_by_row(row))
-            h.addWidget(btn_play)
-            h.addWidget(btn_bat)
-            h.addStretch()
-            w.setLayout(h)
-            self.table.setCellWidget(i, 4, w)
+        self.table_model.set_rows(visible)
+
+    def _on_action_clicked(self, row: int, button: int):
+        if button == 0:
+            self._play_by_row(row)
+        else:
+            self._create_bat_by_row(row)
 
     def _visible_profile_for_row(self, row: int) -> Optional[ProfileItem]:
         try:
@@ -457,24 +781,29 @@ class TeknoManager(QtWidgets.QWidget):
         if prof:
             self._launch_profile(prof)
 
+    def _invalidate_launch_ctx(self, *_args):
+        self._launch_ctx = None
+
+    def _get_launch_ctx(self) -> Tuple[str, List[str], List[str]]:
+        # Exe and flags only change with their widgets, so consecutive launches share the split args
+        if self._launch_ctx is None:
+            exe = self.exe_line.text().strip()
+            prefix = [exe, "--startMinimized"] if self.start_min_cb.isChecked() else [exe]
+            self._launch_ctx = (exe, prefix, self.extra_args_line.text().split())
+        return self._launch_ctx
+
     def _launch_profile(self, prof: ProfileItem):
-        exe = self.exe_line.text().strip()
+        exe, prefix, suffix = self._get_launch_ctx()
         if not exe:
             QtWidgets.QMessageBox.warning(self, "Exe missing", "Please select TeknoParrotUi.exe first.")
             return
         if not Path(exe).exists():
             QtWidgets.QMessageBox.critical(self, "Exe not found", exe)
             return
-        args = [str(exe)]
-        if self.start_min_cb.isChecked():
-            args.append("--startMinimized")
-        args.append(f"--profile={str(prof.xml_path)}")
-        extra = self.extra_args_line.text().strip()
-        if extra:
-            args.extend(extra.split())
+        args = [*prefix, f"--profile={prof.xml_path}", *suffix]
         self.log_msg("Launching:", " ".join(args))
         try:
-            subprocess.Popen(args, shell=False)
+            subprocess.Popen(args, shell=False, close_fds=True)
             self.log_msg("Launched.")
             self.save_settings()
         except Exception as e:
@@ -484,41 +813,61 @@ class TeknoManager(QtWidgets.QWidget):
     # -----------------------
     # Create .bat functions
     # -----------------------
-    def _bat_content_for_profile(self, prof: ProfileItem) -> str:
+    def _prepare_bat_template(self) -> Callable[[ProfileItem], bytes]:
+        # Options are read once per batch; the returned function only fills in the
+        # profile name and XML path and encodes the result
         exe = self.exe_line.text().strip()
         extra = self.extra_args_line.text().strip()
         start_flag = "--startMinimized" if self.start_min_cb.isChecked() else ""
+        head = '@echo off\r\nREM TeknoParrot launcher for profile: '
         if exe and Path(exe).is_absolute():
             tp_dir = Path(exe).parent
             exe_name = Path(exe).name
-            content = (
-                f'@echo off\r\n'
-                f'REM TeknoParrot launcher for profile: {prof.name}\r\n'
-                f'cd /d "{tp_dir}"\r\n'
-                f'start "" "{exe_name}" {start_flag} --profile="{prof.xml_path}" {extra}\r\n'
-                f'exit\r\n'
-            )
+            mid = f'\r\ncd /d "{tp_dir}"\r\nstart "" "{exe_name}" {start_flag} --profile="'
         else:
             exe_to_use = exe if exe else "TeknoParrotUi.exe"
-            content = (
-                f'@echo off\r\n'
-                f'REM TeknoParrot launcher for profile: {prof.name}\r\n'
-                f'start "" "{exe_to_use}" {start_flag} --profile="{prof.xml_path}" {extra}\r\n'
-                f'exit\r\n'
-            )
-        return content
-
-    def _write_bat_for_profile(self, prof: ProfileItem, out_dir: Path) -> Optional[Path]:
+            mid = f'\r\nstart "" "{exe_to_use}" {start_flag} --profile="'
+        tail = f'" {extra}\r\nexit\r\n'
+
+        def render(prof: ProfileItem) -> bytes:
+            return f"{head}{prof.name}{mid}{prof.xml_path}{tail}".encode("utf-8")
+
+        return render
+
+    def _write_bats_for_profiles(self, profiles: List[ProfileItem], out_dir: str) -> List[str]:
+        """Write one .bat per profile into out_dir; returns the paths written, one per profile that succeeded."""
         try:
-            name = sanitize_filename(prof.name) or prof.xml_path.stem
-            out_dir.mkdir(parents=True, exist_ok=True)
-            bat_path = out_dir / f"{name}.bat"
-            bat_path.write_text(self._bat_content_for_profile(prof), encoding="utf-8")
-            # NOTE: removed .cmd generation - only .bat is created now
-            return bat_path
-        except Exception as e:
-            self.log_msg("Error writing bat for", prof.name, ":", e)
-            return None
+            os.makedirs(out_dir, exist_ok=True)  # once for the whole batch
+        except OSError as e:
+            self.log_msg("Error creating output folder", out_dir, ":", e)
+            return []
+
+        # Contents are rendered here from a template built once; only the file I/O goes to
+        # the pool. Profiles sharing a file name keep the last one's content, as with
+        # sequential writes. Names are compared with normcase so "Game.bat" and "game.bat"
+        # (the same file on Windows) are never written by two threads at once.
+        # NOTE: removed .cmd generation - only .bat is created now
+        render = self._prepare_bat_template()
+        targets = []  # (path shown/returned, dedup key) per profile
+        contents = {}  # dedup key -> (path, bytes)
+        for prof in profiles:
+            name = sanitize_filename(prof.name) or prof.stem
+            bat_path = os.path.join(out_dir, name + ".bat")
+            key = os.path.normcase(bat_path)
+            targets.append((bat_path, key))
+            contents[key] = (bat_path, render(prof))
+
+        with ThreadPoolExecutor(max_workers=BAT_WRITE_WORKERS) as ex:
+            errors = dict(zip(contents, ex.map(lambda item: write_bytes_file(*item), contents.values())))
+
+        written = []
+        for prof, (bat_path, key) in zip(profiles, targets):
+            err = errors[key]
+            if err is None:
+                written.append(bat_path)
+            else:
+                self.log_msg("Error writing bat for", prof.name, ":", err)
+        return written
 
     def _create_bat_by_row(self, row: int):
         prof = self._visible_profile_for_row(row)
@@ -528,8 +877,9 @@ class TeknoManager(QtWidgets.QWidget):
         if not out:
             QtWidgets.QMessageBox.warning(self, "Output missing", "Select output folder first.")
             return
-        path = self._write_bat_for_profile(prof, Path(out))
-        if path:
+        written = self._write_bats_for_profiles([prof], out)
+        if written:
+            path = written[0]
             self.log_msg("Created:", path)
             QtWidgets.QMessageBox.information(self, "Created", f"Created .bat:\n{path}")
             self.save_settings()
@@ -544,13 +894,8 @@ class TeknoManager(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Output missing", "Select output folder first.")
             return
         out_dir = Path(out)
-        created = 0
-        for s in sel:
-            prof = self._visible_profile_for_row(s.row())
-            if prof:
-                p = self._write_bat_for_profile(prof, out_dir)
-                if p:
-                    created += 1
+        profs = [prof for prof in (self._visible_profile_for_row(s.row()) for s in sel) if prof]
+        created = len(self._write_bats_for_profiles(profs, str(out_dir)))
         self.log_msg(f"Created {created} .bat files in {out_dir}")
         QtWidgets.QMessageBox.information(self, "Done", f"Created {created} .bat files in:\n{out_dir}")
         self.save_settings()
@@ -561,11 +906,7 @@ class TeknoManager(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Output missing", "Select output folder first.")
             return
         out_dir = Path(out)
-        created = 0
-        for prof in getattr(self, "_visible_profiles", []):
-            p = self._write_bat_for_profile(prof, out_dir)
-            if p:
-                created += 1
+        created = len(self._write_bats_for_profiles(getattr(self, "_visible_profiles", []), str(out_dir)))
         self.log_msg(f"Created {created} .bat files for visible profiles in {out_dir}")
         QtWidgets.QMessageBox.information(self, "Done", f"Created {created} .bat files in:\n{out_dir}")
         self.save_settings()
@@ -585,13 +926,12 @@ class TeknoManager(QtWidgets.QWidget):
             return
 
         try:
-            lines = []
-            for prof in self.profiles:
-                left = prof.name.strip()
-                right = prof.xml_path.stem.strip()
-                lines.append(f"{left} = {right}")
-
-            Path(out).write_text("\n".join(lines), encoding="utf-8")
+            # Stream encoded lines through one large buffer instead of building the whole text;
+            # same layout as before: platform line endings between lines, none after the last
+            sep = os.linesep.encode("ascii")
+            with open(out, "wb", buffering=1 << 20) as f:
+                f.writelines((sep if i else b"") + f"{prof.name} = {prof.stem.strip()}".encode("utf-8")
+                             for i, prof in enumerate(self.profiles))
 
             self.log_msg("Listado creado:", out)
             QtWidgets.QMessageBox.information(self, "Correcto", f"Listado generado:\n{out}")
@@ -624,30 +964,36 @@ class TeknoManager(QtWidgets.QWidget):
             import configparser
             config = configparser.ConfigParser()
             config.optionxform = str  # preserve case
-            config.read(ini_path, encoding="utf-8")
+            # Un único read + parse del INI; el diálogo trabaja sobre este config en memoria
+            config.read_string(ini_path.read_text(encoding="utf-8"), source=str(ini_path))
+
+            def write_config():
+                # Serializar en memoria y escribir de una vez en un fichero hermano que se intercambia
+                buf = io.StringIO()
+                config.write(buf)
+                tmp_file = str(ini_path) + ".tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    f.write(buf.getvalue())
+                os.replace(tmp_file, ini_path)
 
             # Create dialog
             dialog = QtWidgets.QDialog(self)
             dialog.setWindowTitle(f"Editar módulo: {ini_path.name}")
+            dialog.resize(800, 600)
             dlg_layout = QtWidgets.QVBoxLayout(dialog)
 
-            edits = {}  # (section, key) -> QLineEdit
-
-            # Mostrar secciones y claves existentes para editar
-            for section in config.sections():
-                section_label = QtWidgets.QLabel(f"[{section}]")
-                section_label.setStyleSheet("font-weight: bold; margin-top: 8px;")
-                dlg_layout.addWidget(section_label)
-
-                for key, value in config[section].items():
-                    h = QtWidgets.QHBoxLayout()
-                    lbl = QtWidgets.QLabel(key)
-                    lbl.setFixedWidth(120)
-                    edt = QtWidgets.QLineEdit(value)
-                    edits[(section, key)] = edt
-                    h.addWidget(lbl)
-                    h.addWidget(edt)
-                    dlg_layout.addLayout(h)
+            # Mostrar secciones y claves existentes para editar: una fila por clave; la vista
+            # solo crea un QLineEdit mientras se edita un valor (doble clic / F2)
+            entries = IniEntriesModel(config, dialog)
+            view = QtWidgets.QTableView()
+            view.setModel(entries)
+            view.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.DoubleClicked
+                                 | QtWidgets.QAbstractItemView.EditTrigger.EditKeyPressed
+                                 | QtWidgets.QAbstractItemView.EditTrigger.AnyKeyPressed)
+            view.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+            view.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+            view.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeMode.Stretch)
+            dlg_layout.addWidget(view, 1)
 
             # Checkbox para elegir si volcar solo visibles o todas
             chk_only_visible = QtWidgets.QCheckBox("Volcar solo perfiles visibles (filtrados por categoría)")
@@ -665,13 +1011,12 @@ class TeknoManager(QtWidgets.QWidget):
             dlg_layout.addLayout(btns)
 
             def save_changes():
-                # Update config with edited values
-                for (sec, key), widget in edits.items():
+                # Update config with edited values (an open editor commits when the button takes focus)
+                for (sec, key), value in entries.edits.items():
                     if not config.has_section(sec):
                         config.add_section(sec)
-                    config[sec][key] = widget.text()
-                with open(ini_path, "w", encoding="utf-8") as f:
-                    config.write(f)
+                    config[sec][key] = value
+                write_config()
                 self.log_msg("INI actualizado:", ini_path)
                 QtWidgets.QMessageBox.information(self, "Guardado", "El módulo fue modificado correctamente.")
                 dialog.accept()
@@ -687,9 +1032,6 @@ class TeknoManager(QtWidgets.QWidget):
                 Solo se volcarán los perfiles visibles si chk_only_visible está marcado,
                 en caso contrario se volcarán todos los perfiles cargados en self.profiles.
                 """
-                # Recargar config actual antes de modificar (por si se editó)
-                config.read(ini_path, encoding="utf-8")
-
                 # Seleccionar lista a volcar: visibles si existe self._visible_profiles y checkbox marcado
                 if chk_only_visible.isChecked():
                     profiles_to_dump = getattr(self, "_visible_profiles", [])[:]  # copia para seguridad
@@ -702,19 +1044,20 @@ class TeknoManager(QtWidgets.QWidget):
                                                   "No hay perfiles visibles para volcar. Cambia la categoría o desmarca la opción.")
                     return
 
+                # Opciones comunes a todos los perfiles: se leen una sola vez
+                extra = self.extra_args_line.text().strip()
+                start_flag = "--startMinimized" if self.start_min_cb.isChecked() else ""
+                exe_name = Path(
+                    self.exe_line.text().strip()).name if self.exe_line.text().strip() else "TeknoParrotUi.exe"
+
                 # For each profile, add/replace a section named exactamente como prof.name (o sanitized)
                 for prof in profiles_to_dump:
-                    section_name = prof.name or prof.xml_path.stem
-                    section_name = section_name.replace("\n", " ").strip()
+                    section_name = (prof.name or prof.stem).replace("\n", " ").strip()
 
                     if not config.has_section(section_name):
                         config.add_section(section_name)
 
-                    shortname = prof.xml_path.stem
-                    extra = self.extra_args_line.text().strip()
-                    start_flag = "--startMinimized" if self.start_min_cb.isChecked() else ""
-                    exe_name = Path(
-                        self.exe_line.text().strip()).name if self.exe_line.text().strip() else "TeknoParrotUi.exe"
+                    shortname = prof.stem
 
                     # Puedes ajustar la plantilla FadeTitle aquí si quieres otro formato
                     fade_title = f"Play! - [ {shortname} ] - TeknoParrot"
@@ -737,8 +1080,7 @@ class TeknoManager(QtWidgets.QWidget):
                             del config[section_name]["GamePath"]
 
                 # Finalmente escribimos el INI
-                with open(ini_path, "w", encoding="utf-8") as f:
-                    config.write(f)
+                write_config()
 
                 self.log_msg(f"Volcados {len(profiles_to_dump)} perfiles en {ini_path}")
                 QtWidgets.QMessageBox.information(self, "Volcado completado",
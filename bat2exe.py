@@ -1,8 +1,86 @@
 import os
+import sys
 import subprocess
 import shutil
 
 
+# Código del EXE genérico: ejecuta el .bat que tiene su mismo nombre y está a su lado
+# (p. ej. "Juego.exe" -> "Juego.bat"). Se compila una vez y se copia por cada .bat.
+RUNNER_SOURCE = (
+    "import os\n"
+    "import sys\n"
+    "\n"
+    "bat = os.path.splitext(sys.executable)[0] + \".bat\"\n"
+    "sys.exit(os.system('\"' + bat + '\"'))\n"
+)
+RUNNER_NAME = "run_bat"
+
+# Windows: que PyInstaller no abra un conhost.exe (0 en el resto de sistemas)
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _runner_dir():
+    # Caché del EXE genérico junto al script (o junto a bat2exe.exe si está congelado)
+    if getattr(sys, "frozen", False):
+        base = os.path.dirname(sys.executable)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, "bat2exe_runner")
+
+
+def obtener_runner():
+    """
+    Devuelve la ruta del EXE genérico. Solo se ejecuta PyInstaller si aún no
+    existe o si RUNNER_SOURCE ha cambiado; None si la compilación falla.
+    """
+    carpeta = _runner_dir()
+    runner_py = os.path.join(carpeta, RUNNER_NAME + ".py")
+    runner_exe = os.path.join(carpeta, RUNNER_NAME + (".exe" if os.name == "nt" else ""))
+
+    try:
+        with open(runner_py, encoding="utf-8") as f:
+            al_dia = f.read() == RUNNER_SOURCE
+    except OSError:
+        al_dia = False
+    if al_dia and os.path.isfile(runner_exe):
+        return runner_exe
+
+    print("Compilando el EXE genérico (solo la primera vez)...")
+    os.makedirs(carpeta, exist_ok=True)
+    # Quitar el EXE anterior: si la compilación falla no debe quedar uno
+    # obsoleto junto a un run_bat.py que ya lo da por actualizado
+    try:
+        os.remove(runner_exe)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"✘ No se pudo sustituir {runner_exe}: {e}")
+        return None
+    with open(runner_py, "w", encoding="utf-8") as f:
+        f.write(RUNNER_SOURCE)
+
+    build_tmp = os.path.join(carpeta, "build_tmp")
+    p = subprocess.run([
+        "pyinstaller",
+        "--onefile",
+        "--distpath", carpeta,
+        "--workpath", build_tmp,
+        "--specpath", build_tmp,
+        "--name", RUNNER_NAME,
+        runner_py
+    ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace",
+        creationflags=_NO_WINDOW)
+
+    # Borrar carpeta temporal build_tmp (.spec incluido)
+    if os.path.isdir(build_tmp):
+        shutil.rmtree(build_tmp)
+
+    if p.returncode != 0 or not os.path.isfile(runner_exe):
+        print(f"✘ Error compilando el EXE genérico (código {p.returncode})\n{p.stdout}")
+        return None
+    return runner_exe
+
+
 def convertir_bat_a_exe_en_carpeta(carpeta):
     if not os.path.isdir(carpeta):
         print("La ruta indicada no es una carpeta válida.")
@@ -15,47 +93,27 @@ def convertir_bat_a_exe_en_carpeta(carpeta):
         print("No se encontraron archivos .bat en la carpeta.")
         return
 
+    runner = obtener_runner()
+    if runner is None:
+        return
+
     print(f"Encontrados {len(archivos_bat)} archivos .bat. Convirtiendo...\n")
 
+    # Cada EXE es una copia del genérico con el nombre del .bat
+    errores = 0
     for bat in archivos_bat:
-        ruta_bat = os.path.join(carpeta, bat)
-        nombre_base = os.path.splitext(bat)[0]
-        nombre_exe = nombre_base  # sin extensión, PyInstaller agrega .exe
-
-        print(f"Creando EXE para: {bat}")
-
-        # Crear wrapper temporal
-        wrapper_py = os.path.join(carpeta, f"wrapper_{nombre_base}.py")
-        with open(wrapper_py, "w") as f:
-            f.write(f'import os\nos.system(r"{ruta_bat}")')
-
-        # Ejecutar pyinstaller
-        subprocess.call([
-            "pyinstaller",
-            "--onefile",
-            "--distpath", carpeta,  # EXE final en misma carpeta
-            "--workpath", os.path.join(carpeta, "build_tmp"),  # carpeta temporal
-            "--specpath", carpeta,  # colocar el .spec ahí también
-            "--name", nombre_exe,
-            wrapper_py
-        ])
-
-        # Eliminar wrapper y archivos temporales
-        os.remove(wrapper_py)
-
-        # limpiar .spec
-        spec_file = os.path.join(carpeta, f"{nombre_exe}.spec")
-        if os.path.exists(spec_file):
-            os.remove(spec_file)
-
-        print(f"✔ EXE creado: {nombre_exe}.exe\n")
-
-    # Borrar carpeta temporal build_tmp
-    build_tmp = os.path.join(carpeta, "build_tmp")
-    if os.path.isdir(build_tmp):
-        shutil.rmtree(build_tmp)
+        nombre_exe = os.path.splitext(bat)[0] + ".exe"
+        try:
+            shutil.copy2(runner, os.path.join(carpeta, nombre_exe))
+            print(f"✔ EXE creado: {nombre_exe}")
+        except OSError as e:
+            errores += 1
+            print(f"✘ Error creando EXE para: {bat} ({e})")
 
-    print("✔ Todos los archivos fueron convertidos exitosamente.")
+    if errores:
+        print(f"\n✘ {errores} de {len(archivos_bat)} archivos no se pudieron convertir.")
+    else:
+        print("\n✔ Todos los archivos fueron convertidos exitosamente.")
 
 
 # ------------------------------
@@ -64,4 +122,3 @@ def convertir_bat_a_exe_en_carpeta(carpeta):
 if __name__ == "__main__":
     carpeta = input("Indica la carpeta donde están los .bat: ").strip('"')
     convertir_bat_a_exe_en_carpeta(carpeta)
-
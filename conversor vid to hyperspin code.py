@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import re
@@ -6,18 +7,58 @@ import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Set, Tuple
 
-from PyQt6.QtCore import QProcess, Qt
+try:
+    import orjson  # opcional: parseo JSON más rápido
+except ImportError:
+    orjson = None
+
+from PyQt6.QtCore import QObject, QProcess, Qt, QTimer, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFileDialog, QMessageBox,
     QLabel, QLineEdit, QPushButton, QPlainTextEdit, QProgressBar,
     QHBoxLayout, QVBoxLayout, QGroupBox, QFormLayout,
-    QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox
+    QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QSpinBox
 )
 
 
+json_loads = orjson.loads if orjson is not None else json.loads
+
 VIDEO_EXTS = {".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v"}
+TEMP_SUFFIX = "_convirtiendo"  # sufijo del archivo temporal mientras ffmpeg escribe
+
+# ffmpeg simultáneos por defecto (libx264 ya usa varios hilos por proceso)
+DEFAULT_PARALLEL_JOBS = max(1, min(4, (os.cpu_count() or 2) // 2))
+PROBE_WORKERS = 8  # ffprobe simultáneos (esperan sobre todo E/S)
+CONFIG_SAVE_DELAY_MS = 500  # varias llamadas seguidas a schedule_save_config -> una sola escritura
+LOG_FLUSH_MS = 200  # el log se actualiza como mucho cada 200 ms
+LOG_MAX_BLOCKS = 5000  # líneas que conserva el log; las más antiguas se descartan
+
+# Parámetros de vídeo por codificador. libx264 (CPU) es el de siempre; los de GPU se usan
+# si se marca "Usar GPU" y ffmpeg los incluye, en este orden de preferencia.
+CPU_ENCODER = "libx264"
+VIDEO_ENCODER_ARGS: Dict[str, List[str]] = {
+    "libx264": ["-c:v", "libx264", "-profile:v", "high", "-level", "4.1",
+                "-pix_fmt", "yuv420p", "-preset", "slow", "-crf", "18"],
+    "h264_nvenc": ["-c:v", "h264_nvenc", "-preset", "p5", "-tune", "hq", "-rc", "vbr", "-cq", "20", "-b:v", "0",
+                   "-profile:v", "high", "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-c:v", "h264_qsv", "-preset", "slow", "-global_quality", "20",
+                 "-profile:v", "high", "-pix_fmt", "nv12"],
+    "h264_amf": ["-c:v", "h264_amf", "-quality", "quality", "-rc", "cqp", "-qp_i", "20", "-qp_p", "20",
+                 "-profile:v", "high", "-pix_fmt", "yuv420p"],
+    "h264_videotoolbox": ["-c:v", "h264_videotoolbox", "-q:v", "65", "-profile:v", "high", "-pix_fmt", "yuv420p"],
+}
+GPU_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_amf", "h264_videotoolbox")
+
+# Regex compiladas una vez: on_ready_read se ejecuta con cada bloque de salida de ffmpeg
+_TIME_RE = re.compile(r"(?P<h>\d+):(?P<m>\d+):(?P<s>\d+(?:\.\d+)?)")
+_DURATION_RE = re.compile(r"Duration:\s*(\d+:\d+:\d+(?:\.\d+)?)")
+_FFMPEG_TIME_RE = re.compile(rb"time=(\d+:\d+:\d+(?:\.\d+)?)")  # sobre los bytes sin decodificar
+
+# Windows: lanzar ffmpeg/ffprobe sin consola, así no se crea un conhost.exe por proceso
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000)
+NO_WINDOW_FLAGS = CREATE_NO_WINDOW if sys.platform == "win32" else 0
 
 
 def human_path(p: str) -> str:
@@ -35,19 +76,35 @@ def config_path() -> Path:
 
 
 def load_config() -> dict:
-    p = config_path()
-    if p.exists():
-        try:
-            return json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
+    # Un único read a memoria y un parse directo de los bytes (orjson y json aceptan bytes)
+    try:
+        data = config_path().read_bytes()
+    except OSError:
+        return {}
+    try:
+        return json_loads(data)
+    except Exception:
+        return {}
+
+
+_last_saved_config: Optional[bytes] = None  # contenido escrito en config.json en esta sesión
+
+
+def dump_config(cfg: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(cfg, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(cfg, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def save_config(cfg: dict) -> None:
+    global _last_saved_config
     p = config_path()
     try:
-        p.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+        blob = dump_config(cfg)
+        if blob == _last_saved_config:
+            return  # nada ha cambiado desde la última escritura
+        p.write_bytes(blob)
+        _last_saved_config = blob
     except Exception as e:
         # No bloqueamos la app por esto, pero lo registramos en consola si existe.
         print(f"[WARN] No pude guardar config.json: {e}", file=sys.stderr)
@@ -96,7 +153,7 @@ def safe_stem_with_suffix(stem: str, suffix: str) -> str:
 
 
 def parse_time_to_seconds(t: str) -> Optional[float]:
-    m = re.match(r"(?P<h>\d+):(?P<m>\d+):(?P<s>\d+(?:\.\d+)?)", t)
+    m = _TIME_RE.match(t)
     if not m:
         return None
     h = int(m.group("h"))
@@ -107,27 +164,24 @@ def parse_time_to_seconds(t: str) -> Optional[float]:
 
 def probe_duration_seconds(ffmpeg_path: str, video_path: str) -> Optional[float]:
     """
-    Intenta ffprobe primero; si no, usa ffmpeg -i parseando 'Duration:'.
+    Intenta ffprobe primero (salida JSON, parseada desde bytes);
+    si no, usa ffmpeg -i parseando 'Duration:'.
     """
     ffprobe = get_default_ffprobe_path(ffmpeg_path)
     if ffprobe:
         try:
             p = subprocess.run(
-                [ffprobe, "-v", "error", "-show_entries", "format=duration",
-                 "-of", "default=noprint_wrappers=1:nokey=1", video_path],
+                [ffprobe, "-v", "error", "-print_format", "json",
+                 "-show_entries", "format=duration", video_path],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="ignore"
+                stderr=subprocess.DEVNULL,
+                creationflags=NO_WINDOW_FLAGS
             )
-            s = p.stdout.strip()
-            if s:
-                return float(s)
+            return float(json_loads(p.stdout)["format"]["duration"])
         except Exception:
             pass
 
-    # Fallback ffmpeg -i
+    # Fallback ffmpeg -i (por si no hay ffprobe junto a ffmpeg ni en PATH)
     try:
         p = subprocess.run(
             [ffmpeg_path, "-i", video_path],
@@ -135,9 +189,10 @@ def probe_duration_seconds(ffmpeg_path: str, video_path: str) -> Optional[float]
             stderr=subprocess.STDOUT,
             text=True,
             encoding="utf-8",
-            errors="ignore"
+            errors="ignore",
+            creationflags=NO_WINDOW_FLAGS
         )
-        m = re.search(r"Duration:\s*(\d+:\d+:\d+(?:\.\d+)?)", p.stdout)
+        m = _DURATION_RE.search(p.stdout)
         if not m:
             return None
         return parse_time_to_seconds(m.group(1))
@@ -145,6 +200,51 @@ def probe_duration_seconds(ffmpeg_path: str, video_path: str) -> Optional[float]
         return None
 
 
+def gpu_encoder_works(ffmpeg_path: str, encoder: str) -> bool:
+    # Codificar un fotograma sintético: falla si no hay GPU/driver compatible en esta máquina
+    try:
+        p = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-v", "error", "-f", "lavfi", "-i", "color=s=256x256",
+             "-frames:v", "1", *VIDEO_ENCODER_ARGS[encoder], "-f", "null", "-"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+            creationflags=NO_WINDOW_FLAGS
+        )
+    except Exception:
+        return False
+    return p.returncode == 0
+
+
+@functools.lru_cache(maxsize=None)
+def detect_gpu_encoders(ffmpeg_path: str) -> List[str]:
+    """
+    Codificadores H.264 por GPU que este ffmpeg incluye (ffmpeg -encoders) y que
+    además funcionan en esta máquina, en orden de preferencia. Las compilaciones
+    habituales traen NVENC, QSV y AMF juntos, así que cada uno se prueba con un
+    fotograma real. Se consulta una vez por ruta de ffmpeg.
+    """
+    try:
+        p = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            creationflags=NO_WINDOW_FLAGS
+        )
+    except Exception:
+        return []
+    available = {parts[1] for parts in (line.split() for line in p.stdout.splitlines()) if len(parts) > 1}
+    return [enc for enc in GPU_ENCODERS if enc in available and gpu_encoder_works(ffmpeg_path, enc)]
+
+
+def _no_window_modifier(args) -> None:
+    # QProcess.CreateProcessArguments: añadir CREATE_NO_WINDOW a los flags de CreateProcess
+    args.flags |= CREATE_NO_WINDOW
+
+
 @dataclass
 class Job:
     input_path: str
@@ -152,6 +252,44 @@ class Job:
     final_path: str
     duration_sec: Optional[float] = None
     row_index: int = -1
+    encoder: str = CPU_ENCODER
+    gpu_failed: bool = False  # reintento con libx264 tras fallar el codificador de GPU
+    progress: int = 0  # % del archivo, según el último time= de ffmpeg
+
+
+class ProbeTask(QRunnable):
+    """
+    Calcula la duración de un trabajo en un hilo del pool, fuera del hilo de la GUI.
+    on_ready_read empieza a mostrar el % en cuanto job.duration_sec tiene valor.
+    """
+
+    def __init__(self, job: Job, ffmpeg_path: str):
+        super().__init__()
+        self.job = job
+        self.ffmpeg_path = ffmpeg_path
+
+    def run(self):
+        self.job.duration_sec = probe_duration_seconds(self.ffmpeg_path, self.job.input_path)
+
+
+class GpuDetectSignals(QObject):
+    finished = pyqtSignal(str, object)  # (ruta de ffmpeg, lista de codificadores de GPU)
+
+
+class GpuDetectTask(QRunnable):
+    """
+    Ejecuta detect_gpu_encoders en un hilo del pool: ffmpeg -encoders y una codificación
+    de prueba por codificador pueden tardar segundos. El resultado llega por señal al
+    hilo de la GUI.
+    """
+
+    def __init__(self, ffmpeg_path: str, signals: GpuDetectSignals):
+        super().__init__()
+        self.ffmpeg_path = ffmpeg_path
+        self.signals = signals
+
+    def run(self):
+        self.signals.finished.emit(self.ffmpeg_path, detect_gpu_encoders(self.ffmpeg_path))
 
 
 class MainWindow(QMainWindow):
@@ -167,14 +305,41 @@ class MainWindow(QMainWindow):
         self.resize(1100, 720)
 
         self.cfg = load_config()
-
-        self.proc = QProcess(self)
-        self.proc.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-        self.proc.readyReadStandardOutput.connect(self.on_ready_read)
-        self.proc.finished.connect(self.on_finished)
+        self._save_cfg_timer = QTimer(self)
+        self._save_cfg_timer.setSingleShot(True)
+        self._save_cfg_timer.setInterval(CONFIG_SAVE_DELAY_MS)
+        self._save_cfg_timer.timeout.connect(lambda: save_config(self.cfg))
+
+        # Pool de QProcess: se crean según hagan falta (hasta "Simultáneos") y se reutilizan;
+        # running asocia cada proceso en marcha con su trabajo
+        self.procs: List[QProcess] = []
+        self.running: Dict[QProcess, Job] = {}
+
+        self.probe_pool = QThreadPool(self)
+        self.probe_pool.setMaxThreadCount(PROBE_WORKERS)
+
+        # Codificadores de GPU detectados en segundo plano, por ruta de ffmpeg; un lote que
+        # empieza antes de conocerlos usa libx264 hasta que llega el resultado
+        self.gpu_pool = QThreadPool(self)
+        self.gpu_pool.setMaxThreadCount(1)
+        self._gpu_signals = GpuDetectSignals()
+        self._gpu_signals.finished.connect(self.on_gpu_detected)
+        self._gpu_encoders: Dict[str, List[str]] = {}
+        self._gpu_detecting: Set[str] = set()
+        self._batch_gpu_ff: Optional[str] = None  # ffmpeg del lote que espera la detección
+
+        # Log por lotes: las líneas se acumulan y un temporizador las vuelca de una vez.
+        # La salida de ffmpeg se guarda sin decodificar, por proceso, hasta ese volcado.
+        self._log_buf: List[str] = []
+        self._ff_log_bufs: Dict[QProcess, bytearray] = {}
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self.flush_log)
 
         self.jobs: List[Job] = []
-        self.current_job: Optional[Job] = None
+        self.cancelled: bool = False
+        self._ffmpeg_cache: Optional[Tuple[str, str]] = None  # (texto de le_ffmpeg, ruta resuelta)
         self.total_jobs: int = 0
         self.jobs_done: int = 0
 
@@ -246,9 +411,23 @@ class MainWindow(QMainWindow):
         self.btn_cancel.clicked.connect(self.cancel)
         self.btn_cancel.setEnabled(False)
 
+        self.chk_gpu = QCheckBox("Usar GPU")
+        self.chk_gpu.setToolTip("Codificar con NVENC / Quick Sync / AMF si ffmpeg los incluye (si falla, se usa libx264)")
+        self.chk_gpu.setChecked(bool(self.cfg.get("use_gpu", False)))
+        self.chk_gpu.toggled.connect(self.on_gpu_toggled)
+
+        self.spin_parallel = QSpinBox()
+        self.spin_parallel.setRange(1, max(1, os.cpu_count() or 1))
+        self.spin_parallel.setValue(int(self.cfg.get("parallel_jobs", DEFAULT_PARALLEL_JOBS)))
+        self.spin_parallel.setToolTip("Número de vídeos que se convierten a la vez")
+        self.spin_parallel.valueChanged.connect(self.on_parallel_changed)
+
         controls = QHBoxLayout()
         controls.addWidget(self.chk_all)
         controls.addStretch(1)
+        controls.addWidget(QLabel("Simultáneos:"))
+        controls.addWidget(self.spin_parallel)
+        controls.addWidget(self.chk_gpu)
         controls.addWidget(self.btn_convert)
         controls.addWidget(self.btn_cancel)
 
@@ -264,6 +443,7 @@ class MainWindow(QMainWindow):
         # Log
         self.log = QPlainTextEdit()
         self.log.setReadOnly(True)
+        self.log.setMaximumBlockCount(LOG_MAX_BLOCKS)
 
         layout = QVBoxLayout()
         layout.addWidget(gb_folder)
@@ -272,7 +452,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(QLabel("Lista de vídeos:"))
         layout.addWidget(self.table, 1)
 
-        layout.addWidget(QLabel("Progreso archivo actual:"))
+        layout.addWidget(QLabel("Progreso archivos en curso (media):"))
         layout.addWidget(self.progress_file)
         layout.addWidget(QLabel("Progreso total:"))
         layout.addWidget(self.progress_total)
@@ -286,13 +466,57 @@ class MainWindow(QMainWindow):
         if self.le_folder.text().strip():
             self.scan_folder()
 
+        # Con "Usar GPU" guardado, detectar ya los codificadores
+        if self.chk_gpu.isChecked():
+            self.request_gpu_detection()
+
     def _wrap(self, hbox: QHBoxLayout) -> QWidget:
         w = QWidget()
         w.setLayout(hbox)
         return w
 
     def append_log(self, text: str):
-        self.log.appendPlainText(text.rstrip())
+        self._log_buf.append(text.rstrip())
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def flush_log(self):
+        # Un único appendPlainText (una sola actualización del documento) por volcado
+        self._log_timer.stop()
+        self.flush_ffmpeg_log()
+        if self._log_buf:
+            self.log.appendPlainText("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def clear_log(self):
+        self._log_buf.clear()
+        for buf in self._ff_log_bufs.values():
+            buf.clear()
+        self.log.clear()
+
+    def schedule_save_config(self):
+        # (Re)arranca el temporizador: una ráfaga de cambios acaba en una sola escritura
+        self._save_cfg_timer.start()
+
+    def closeEvent(self, event):
+        # Descartar duraciones pendientes: ~QThreadPool esperaría a que se ejecutaran todas
+        self.probe_pool.clear()
+        # Guardar lo que aún esté esperando al temporizador
+        if self._save_cfg_timer.isActive():
+            self._save_cfg_timer.stop()
+            save_config(self.cfg)
+        super().closeEvent(event)
+
+    def flush_ffmpeg_log(self):
+        # Pasa al log la salida de ffmpeg acumulada (un decode por proceso); también se llama
+        # antes de escribir mensajes propios para que el orden se mantenga. Con varios ffmpeg
+        # a la vez cada bloque lleva el nombre de su archivo
+        for proc, buf in self._ff_log_bufs.items():
+            if buf:
+                job = self.running.get(proc)
+                header = f"[{Path(job.input_path).name}]\n" if job else ""
+                self.append_log(header + buf.decode("utf-8", errors="ignore"))
+                buf.clear()
 
     def pick_folder(self):
         start = self.le_folder.text().strip() or str(Path.home())
@@ -300,7 +524,7 @@ class MainWindow(QMainWindow):
         if folder:
             self.le_folder.setText(human_path(folder))
             self.cfg["last_folder"] = self.le_folder.text().strip()
-            save_config(self.cfg)
+            self.schedule_save_config()
 
     def pick_ffmpeg(self):
         start = str(Path(self.le_ffmpeg.text().strip() or str(Path.home())).parent)
@@ -311,16 +535,28 @@ class MainWindow(QMainWindow):
         if exe_path:
             self.le_ffmpeg.setText(human_path(exe_path))
             self.cfg["ffmpeg_path"] = self.le_ffmpeg.text().strip()
-            save_config(self.cfg)
+            self.schedule_save_config()
+            if self.chk_gpu.isChecked():
+                self.request_gpu_detection()
 
     def ffmpeg_exe(self) -> Optional[str]:
-        s = self.le_ffmpeg.text().strip()
+        # Se llama al empezar cada trabajo: la ruta se resuelve una vez por valor del campo
+        # (sin repetir exists/búsqueda en PATH); un resultado vacío no se guarda
+        text = self.le_ffmpeg.text()
+        if self._ffmpeg_cache is not None and self._ffmpeg_cache[0] == text:
+            return self._ffmpeg_cache[1]
+        s = text.strip()
+        resolved = None
         if s:
             s = human_path(s)
             if os.path.exists(s):
-                return s
-        # si no está escrito o es inválido
-        return get_default_ffmpeg_path()
+                resolved = s
+        if resolved is None:
+            # si no está escrito o es inválido
+            resolved = get_default_ffmpeg_path()
+        if resolved:
+            self._ffmpeg_cache = (text, resolved)
+        return resolved
 
     def scan_folder(self):
         folder = self.le_folder.text().strip()
@@ -329,42 +565,66 @@ class MainWindow(QMainWindow):
             return
 
         self.cfg["last_folder"] = folder
-        save_config(self.cfg)
+        self.schedule_save_config()
 
+        # os.scandir: cada DirEntry trae el tipo (y en Windows el tamaño) del propio
+        # listado, sin un stat aparte por archivo
         p = Path(folder)
         videos = []
-        for f in p.iterdir():
-            if f.is_file() and f.suffix.lower() in VIDEO_EXTS:
+        with os.scandir(p) as it:
+            tail_len = len(TEMP_SUFFIX)
+            for entry in it:
+                # Solo operaciones sobre el nombre: se descarta lo que no es vídeo sin crear Path
+                # ni pasar el nombre entero a minúsculas (como Path.suffix, ".mp4" no cuenta)
+                name = entry.name
+                dot = name.rfind(".")
+                if dot <= 0 or name[dot:].lower() not in VIDEO_EXTS:
+                    continue
                 # Evitar listar temporales "*_convirtiendo"
-                if f.stem.lower().endswith("_convirtiendo"):
+                if name[max(0, dot - tail_len):dot].lower() == TEMP_SUFFIX:
                     continue
-                videos.append(f)
+                if entry.is_file():
+                    videos.append(entry)
 
-        videos.sort(key=lambda x: x.name.lower())
+        videos.sort(key=lambda e: e.name.lower())
 
-        self.table.setRowCount(0)
         self.chk_all.blockSignals(True)
         self.chk_all.setChecked(False)
         self.chk_all.blockSignals(False)
 
-        for f in videos:
-            self.add_video_row(f)
+        # Relleno en bloque: todas las filas de una vez y sin repintar hasta el final.
+        # Las columnas ResizeToContents se recalcularían con cada celda, así que quedan
+        # fijas durante el relleno y se restauran después.
+        header = self.table.horizontalHeader()
+        auto_cols = [c for c in range(self.table.columnCount())
+                     if header.sectionResizeMode(c) == QHeaderView.ResizeMode.ResizeToContents]
+        self.table.setUpdatesEnabled(False)
+        try:
+            for c in auto_cols:
+                header.setSectionResizeMode(c, QHeaderView.ResizeMode.Fixed)
+            self.table.setRowCount(0)
+            self.table.setRowCount(len(videos))
+            for row, entry in enumerate(videos):
+                self.add_video_row(row, entry)
+        finally:
+            for c in auto_cols:
+                header.setSectionResizeMode(c, QHeaderView.ResizeMode.ResizeToContents)
+            self.table.setUpdatesEnabled(True)
 
         self.append_log(f"Escaneo completado: {len(videos)} vídeos encontrados en {folder}")
 
-    def add_video_row(self, f: Path):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-
-        chk = QCheckBox()
-        chk.setChecked(False)
-        chk.setTristate(False)
-        chk.setStyleSheet("margin-left:12px;")  # centrar un poco
-        self.table.setCellWidget(row, self.COL_CHECK, chk)
-
-        name_item = QTableWidgetItem(f.stem)
-        ext_item = QTableWidgetItem(f.suffix.lower())
-        size_mb = f.stat().st_size / (1024 * 1024)
+    def add_video_row(self, row: int, entry: os.DirEntry):
+        # La fila ya existe (scan_folder fija el número de filas de antemano)
+        # Casilla nativa del item (CheckStateRole) en lugar de un QCheckBox por fila
+        chk_item = QTableWidgetItem()
+        chk_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+        chk_item.setCheckState(Qt.CheckState.Unchecked)
+        self.table.setItem(row, self.COL_CHECK, chk_item)
+
+        stem, ext = os.path.splitext(entry.name)
+        name_item = QTableWidgetItem(stem)
+        ext_item = QTableWidgetItem(ext.lower())
+        size_mb = entry.stat().st_size / (1024 * 1024)
         size_item = QTableWidgetItem(f"{size_mb:.1f} MB")
         status_item = QTableWidgetItem("Pendiente")
 
@@ -376,27 +636,62 @@ class MainWindow(QMainWindow):
         self.table.setItem(row, self.COL_SIZE, size_item)
         self.table.setItem(row, self.COL_STATUS, status_item)
 
-        # Guardar ruta completa en el item (UserRole)
-        name_item.setData(Qt.ItemDataRole.UserRole, str(f))
+        # Guardar ruta completa en el item (UserRole), ya como Path para start_batch
+        name_item.setData(Qt.ItemDataRole.UserRole, Path(entry.path))
 
     def on_select_all(self, state: int):
-        checked = (state == Qt.CheckState.Checked.value)
+        check_state = Qt.CheckState.Checked if state == Qt.CheckState.Checked.value else Qt.CheckState.Unchecked
         for r in range(self.table.rowCount()):
-            w = self.table.cellWidget(r, self.COL_CHECK)
-            if isinstance(w, QCheckBox):
-                w.setChecked(checked)
+            it = self.table.item(r, self.COL_CHECK)
+            if it:
+                it.setCheckState(check_state)
+
+    def on_parallel_changed(self, value: int):
+        self.cfg["parallel_jobs"] = value
+        self.schedule_save_config()
+        # Con un lote en marcha, ocupar enseguida los huecos nuevos
+        if self.running:
+            self.process_next_job()
 
-    def selected_video_paths(self) -> List[str]:
-        paths = []
-        for r in range(self.table.rowCount()):
-            w = self.table.cellWidget(r, self.COL_CHECK)
-            if isinstance(w, QCheckBox) and w.isChecked():
-                item = self.table.item(r, self.COL_NAME)
-                if item:
-                    path = item.data(Qt.ItemDataRole.UserRole)
-                    if path and os.path.exists(path):
-                        paths.append(path)
-        return paths
+    def on_gpu_toggled(self, checked: bool):
+        self.cfg["use_gpu"] = checked
+        self.schedule_save_config()
+        if checked:
+            self.request_gpu_detection()
+
+    def request_gpu_detection(self, ff: Optional[str] = None) -> Optional[List[str]]:
+        # Devuelve los codificadores de GPU ya detectados para este ffmpeg; si aún no se
+        # conocen, lanza la detección (una vez por ruta) y devuelve None
+        ff = ff or self.ffmpeg_exe()
+        if not ff:
+            return None
+        if ff in self._gpu_encoders:
+            return self._gpu_encoders[ff]
+        if ff not in self._gpu_detecting:
+            self._gpu_detecting.add(ff)
+            self.gpu_pool.start(GpuDetectTask(ff, self._gpu_signals))
+        return None
+
+    def on_gpu_detected(self, ff: str, encoders: List[str]):
+        self._gpu_detecting.discard(ff)
+        self._gpu_encoders[ff] = encoders
+        if self._batch_gpu_ff != ff:
+            return
+        # El lote en marcha empezó con libx264: pasar a la GPU los vídeos que siguen en cola
+        self._batch_gpu_ff = None
+        if not self.jobs:
+            return
+        if encoders:
+            self.append_log(f"Codificador GPU: {encoders[0]} (para los vídeos que aún no han empezado)")
+            for job in self.jobs:
+                if not job.gpu_failed:
+                    job.encoder = encoders[0]
+        else:
+            self.append_log("No hay codificador GPU disponible en este ffmpeg; se sigue con libx264.")
+
+    def is_row_checked(self, row: int) -> bool:
+        it = self.table.item(row, self.COL_CHECK)
+        return it is not None and it.checkState() == Qt.CheckState.Checked
 
     def set_row_status(self, row: int, status: str):
         it = self.table.item(row, self.COL_STATUS)
@@ -413,30 +708,19 @@ class MainWindow(QMainWindow):
             )
             return
 
-        selected = self.selected_video_paths()
-        if not selected:
-            QMessageBox.information(self, "Nada seleccionado", "Marca al menos un vídeo para convertir.")
-            return
-
-        # Guardar config
-        self.cfg["ffmpeg_path"] = self.le_ffmpeg.text().strip()
-        self.cfg["last_folder"] = self.le_folder.text().strip()
-        save_config(self.cfg)
-
-        # Preparar trabajos
+        # Preparar trabajos: una sola pasada por las filas marcadas, con el Path guardado al
+        # escanear (si un archivo ya no existe, ffmpeg falla y la fila lo muestra)
         self.jobs = []
         for r in range(self.table.rowCount()):
-            w = self.table.cellWidget(r, self.COL_CHECK)
-            if isinstance(w, QCheckBox) and w.isChecked():
+            if self.is_row_checked(r):
                 item = self.table.item(r, self.COL_NAME)
                 if not item:
                     continue
-                inp = item.data(Qt.ItemDataRole.UserRole)
-                if not inp or not os.path.exists(inp):
+                inp_path = item.data(Qt.ItemDataRole.UserRole)
+                if not inp_path:
                     continue
 
-                inp_path = Path(inp)
-                temp_stem = safe_stem_with_suffix(inp_path.stem, "_convirtiendo")
+                temp_stem = safe_stem_with_suffix(inp_path.stem, TEMP_SUFFIX)
                 temp_path = str(inp_path.with_name(temp_stem + inp_path.suffix))  # mantiene extensión original
                 final_path = str(inp_path)  # se reemplazará con el mismo nombre original
 
@@ -450,15 +734,46 @@ class MainWindow(QMainWindow):
                 self.jobs.append(job)
 
         if not self.jobs:
-            QMessageBox.information(self, "Nada válido", "No hay vídeos válidos seleccionados.")
+            QMessageBox.information(self, "Nada seleccionado", "Marca al menos un vídeo para convertir.")
             return
 
+        # Guardar config
+        self.cfg["ffmpeg_path"] = self.le_ffmpeg.text().strip()
+        self.cfg["last_folder"] = self.le_folder.text().strip()
+        self.schedule_save_config()
+
+        # Codificador del lote: el primero de GPU disponible si se pidió, si no libx264. Si la
+        # detección no ha terminado, se empieza con libx264 y on_gpu_detected cambia la cola
+        gpu: List[str] = []
+        self._batch_gpu_ff = None
+        if self.chk_gpu.isChecked():
+            detected = self.request_gpu_detection(ff)
+            if detected is None:
+                self._batch_gpu_ff = ff
+            else:
+                gpu = detected
+        if gpu:
+            for job in self.jobs:
+                job.encoder = gpu[0]
+
+        # Duraciones (para el progreso por archivo) en segundo plano y en el orden de la cola:
+        # la conversión empieza ya y las siguientes se calculan mientras se codifica
+        for job in self.jobs:
+            self.probe_pool.start(ProbeTask(job, ff))
+
         # UI estado
         self.total_jobs = len(self.jobs)
         self.jobs_done = 0
+        self.cancelled = False
         self.progress_total.setValue(0)
         self.progress_file.setValue(0)
-        self.log.clear()
+        self.clear_log()
+        if gpu:
+            self.append_log(f"Codificador GPU: {gpu[0]}")
+        elif self._batch_gpu_ff:
+            self.append_log("Detectando codificadores GPU; mientras tanto se usa libx264.")
+        elif self.chk_gpu.isChecked():
+            self.append_log("No hay codificador GPU disponible en este ffmpeg; se usa libx264.")
 
         self.btn_convert.setEnabled(False)
         self.btn_cancel.setEnabled(True)
@@ -473,19 +788,40 @@ class MainWindow(QMainWindow):
             "-i", job.input_path,
             "-map", "0:v:0",
             "-map", "0:a?",
-            "-c:v", "libx264", "-profile:v", "high", "-level", "4.1",
-            "-pix_fmt", "yuv420p",
-            "-preset", "slow", "-crf", "18",
+            *VIDEO_ENCODER_ARGS[job.encoder],
             "-c:a", "aac", "-b:a", "128k", "-ar", "48000", "-ac", "2",
             "-movflags", "+faststart",
             job.temp_path
         ]
 
-    def process_next_job(self):
-        if self.proc.state() != QProcess.ProcessState.NotRunning:
-            return
+    def _idle_proc(self) -> QProcess:
+        for proc in self.procs:
+            if proc not in self.running and proc.state() == QProcess.ProcessState.NotRunning:
+                return proc
+        proc = QProcess(self)
+        proc.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        proc.readyReadStandardOutput.connect(lambda p=proc: self.on_ready_read(p))
+        proc.finished.connect(lambda code, status, p=proc: self.on_finished(p, code, status))
+        if sys.platform == "win32" and hasattr(proc, "setCreateProcessArgumentsModifier"):
+            proc.setCreateProcessArgumentsModifier(_no_window_modifier)
+        self.procs.append(proc)
+        self._ff_log_bufs[proc] = bytearray()
+        return proc
 
-        if not self.jobs:
+    def process_next_job(self):
+        # Reparte la cola entre los huecos libres (hasta "Simultáneos" ffmpeg a la vez)
+        while self.jobs and len(self.running) < self.spin_parallel.value():
+            ff = self.ffmpeg_exe()
+            if not ff:
+                QMessageBox.critical(self, "FFmpeg no encontrado", "No encuentro ffmpeg para continuar.")
+                self.jobs.clear()
+                if not self.running:
+                    self.btn_convert.setEnabled(True)
+                    self.btn_cancel.setEnabled(False)
+                return
+            self.start_job(self.jobs.pop(0), ff)
+
+        if not self.jobs and not self.running:
             # Fin
             self.btn_convert.setEnabled(True)
             self.btn_cancel.setEnabled(False)
@@ -493,22 +829,9 @@ class MainWindow(QMainWindow):
             self.progress_total.setValue(100)
             self.append_log("\n=== TODO TERMINADO ===")
             QMessageBox.information(self, "Listo", "Conversión por lotes finalizada.")
-            return
-
-        ff = self.ffmpeg_exe()
-        if not ff:
-            QMessageBox.critical(self, "FFmpeg no encontrado", "No encuentro ffmpeg para continuar.")
-            self.btn_convert.setEnabled(True)
-            self.btn_cancel.setEnabled(False)
-            return
 
-        self.current_job = self.jobs.pop(0)
-        job = self.current_job
-
-        # Status tabla
-        self.set_row_status(job.row_index, "Calculando duración…")
-        job.duration_sec = probe_duration_seconds(ff, job.input_path)
-        self.progress_file.setValue(0)
+    def start_job(self, job: Job, ff: str):
+        job.progress = 0
 
         inp_name = Path(job.input_path).name
         self.append_log(f"\n--- Convirtiendo: {inp_name} ---")
@@ -524,17 +847,27 @@ class MainWindow(QMainWindow):
 
         self.set_row_status(job.row_index, "Convirtiendo…")
 
-        args = self.build_ffmpeg_args(job)
-        self.proc.setProgram(ff)
-        self.proc.setArguments(args)
-        self.proc.start()
+        proc = self._idle_proc()
+        self.running[proc] = job
+        self.update_file_progress()
+        proc.setProgram(ff)
+        proc.setArguments(self.build_ffmpeg_args(job))
+        proc.start()
 
-        if not self.proc.waitForStarted(3000):
+        if not proc.waitForStarted(3000):
+            del self.running[proc]
             self.set_row_status(job.row_index, "ERROR: no inicia FFmpeg")
             self.append_log("ERROR: No pude iniciar FFmpeg.")
             self.jobs_done += 1
             self.update_total_progress()
-            self.process_next_job()
+            self.update_file_progress()
+
+    def update_file_progress(self):
+        # Media del % de los archivos que se están convirtiendo ahora mismo
+        if not self.running:
+            self.progress_file.setValue(0)
+            return
+        self.progress_file.setValue(sum(job.progress for job in self.running.values()) // len(self.running))
 
     def update_total_progress(self):
         if self.total_jobs <= 0:
@@ -544,38 +877,66 @@ class MainWindow(QMainWindow):
         self.progress_total.setValue(max(0, min(100, pct)))
 
     def cancel(self):
-        if self.proc.state() != QProcess.ProcessState.NotRunning:
-            self.append_log("\nCancelando proceso…")
-            self.proc.kill()
-        # También vaciamos cola
+        self.cancelled = True
+        # También vaciamos cola (antes de matar: cada finished llama a process_next_job)
+        # y las duraciones que aún no se han empezado a calcular
         self.jobs.clear()
+        self.probe_pool.clear()
+        if self.running:
+            self.flush_ffmpeg_log()
+            self.append_log("\nCancelando proceso…")
+            for proc in list(self.running):
+                proc.kill()
 
-    def on_ready_read(self):
-        data = bytes(self.proc.readAllStandardOutput()).decode("utf-8", errors="ignore")
-        if not data:
+    def on_ready_read(self, proc: QProcess):
+        raw = bytes(proc.readAllStandardOutput())
+        if not raw:
             return
 
-        self.append_log(data)
+        self._ff_log_bufs[proc] += raw
+        if not self._log_timer.isActive():
+            self._log_timer.start()
 
-        job = self.current_job
+        job = self.running.get(proc)
         if not job or not job.duration_sec:
             return
 
-        # Buscar time=HH:MM:SS.xx
-        m = re.findall(r"time=(\d+:\d+:\d+(?:\.\d+)?)", data)
+        # Solo interesa el último time=HH:MM:SS.xx del bloque: se busca desde el final
+        idx = raw.rfind(b"time=")
+        m = _FFMPEG_TIME_RE.match(raw, idx) if idx >= 0 else None
         if m:
-            t = parse_time_to_seconds(m[-1])
+            t = parse_time_to_seconds(m.group(1).decode("ascii"))
             if t is not None and job.duration_sec > 0:
                 pct = int(max(0, min(100, (t / job.duration_sec) * 100)))
-                self.progress_file.setValue(pct)
+                if pct != job.progress:
+                    job.progress = pct
+                    self.set_row_status(job.row_index, f"Convirtiendo… {pct}%")
+                    self.update_file_progress()
 
-    def on_finished(self, exit_code: int, exit_status: QProcess.ExitStatus):
-        job = self.current_job
-        self.current_job = None
+    def on_finished(self, proc: QProcess, exit_code: int, exit_status: QProcess.ExitStatus):
+        self.flush_ffmpeg_log()
+        job = self.running.pop(proc, None)
+        self.update_file_progress()
 
         if not job:
             return
 
+        # Fallo con un codificador de GPU (sin tarjeta/driver compatible, etc.): se repite el
+        # mismo vídeo con libx264 antes de darlo por fallido
+        if (exit_status == QProcess.ExitStatus.NormalExit and exit_code != 0
+                and job.encoder != CPU_ENCODER and not self.cancelled):
+            self.append_log(f"ERROR con {job.encoder} (código {exit_code}); se reintenta con libx264.")
+            try:
+                if os.path.exists(job.temp_path):
+                    os.remove(job.temp_path)
+            except Exception:
+                pass
+            job.encoder = CPU_ENCODER
+            job.gpu_failed = True
+            self.jobs.insert(0, job)
+            self.process_next_job()
+            return
+
         if exit_status == QProcess.ExitStatus.CrashExit or exit_code != 0:
             self.set_row_status(job.row_index, f"ERROR (code {exit_code})")
             self.append_log(f"ERROR: FFmpeg terminó con código {exit_code}.")
@@ -591,31 +952,32 @@ class MainWindow(QMainWindow):
             self.process_next_job()
             return
 
-        # Éxito: borrar original y renombrar temp al original
+        # Éxito: renombrar temp -> original (mismo nombre sin _convirtiendo).
+        # os.replace sobrescribe el destino de forma atómica en Windows y POSIX: no hace falta
+        # borrar antes el original, y si falla el original sigue intacto
         try:
-            # 1) borrar original
-            if os.path.exists(job.final_path):
-                os.remove(job.final_path)
-
-            # 2) renombrar temp -> original (mismo nombre sin _convirtiendo)
+            size = os.path.getsize(job.temp_path)  # tamaño del resultado: el único stat necesario
             os.replace(job.temp_path, job.final_path)
 
             self.set_row_status(job.row_index, "OK (reemplazado)")
-            self.progress_file.setValue(100)
 
-            # Actualizar tamaño en tabla (por si cambia)
+            # Con CPU funcionó donde la GPU falló: el problema es la GPU, no el vídeo
+            if job.gpu_failed and any(j.encoder != CPU_ENCODER for j in self.jobs):
+                self.append_log("libx264 funcionó donde falló la GPU; el resto del lote se convierte con libx264.")
+                for j in self.jobs:
+                    j.encoder = CPU_ENCODER
+
+            # Actualizar tamaño en tabla (por si cambia); el rename no altera el tamaño
             try:
-                out_size_mb = Path(job.final_path).stat().st_size / (1024 * 1024)
-                self.table.item(job.row_index, self.COL_SIZE).setText(f"{out_size_mb:.1f} MB")
+                self.table.item(job.row_index, self.COL_SIZE).setText(f"{size / (1024 * 1024):.1f} MB")
             except Exception:
                 pass
 
         except Exception as e:
             self.set_row_status(job.row_index, f"ERROR reemplazo")
             self.append_log(f"ERROR al reemplazar archivo: {e}")
-            # Intento de recuperación: si el original se borró y el temp existe, dejarlo al menos
-            # (pero NO inventamos más reglas; lo dejamos registrado)
-            pass
+            # El original no se ha tocado y el temp convertido se queda junto a él
+            # (NO inventamos más reglas; lo dejamos registrado)
 
         self.jobs_done += 1
         self.update_total_progress()